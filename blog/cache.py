@@ -0,0 +1,26 @@
+from globals.databases import primary
+from globals.generations import bump_generation, get_generation
+from globals.single_flight import get_or_build
+from .models import Article
+
+ARTICLE_VERSION_KEY = "blog:article_version"
+LATEST_ARTICLE_TIMEOUT = 60 * 60 * 24
+
+
+def get_article_version():
+    return get_generation(ARTICLE_VERSION_KEY)
+
+
+def bump_article_version():
+    bump_generation(ARTICLE_VERSION_KEY)
+
+
+def get_latest_article():
+    """The most recently published article (or None), cached until any article changes."""
+    return get_or_build(
+        f"blog:latest_article:{get_article_version()}",
+        lambda: primary(Article.objects).select_related("author").only(
+            "title", "summary", "img", "publication_date", "author__username"
+        ).order_by("-publication_date", "-id").first(),
+        LATEST_ARTICLE_TIMEOUT,
+    )
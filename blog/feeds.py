@@ -0,0 +1,39 @@
+from django.contrib.syndication.views import Feed
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+
+from globals.databases import primary
+from .models import Article
+
+FEED_SIZE = 20
+
+
+class LatestArticlesFeed(Feed):
+    title = "Cleaning Service news"
+    link = reverse_lazy("articles")
+    description = "Latest articles from Cleaning Service"
+
+    def items(self):
+        return primary(Article.objects).select_related("author").only(
+            "title", "summary", "publication_date", "author__username"
+        ).order_by("-publication_date", "-id")[:FEED_SIZE]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.summary
+
+    def item_link(self, item):
+        return reverse("article", args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.publication_date
+
+    def item_author_name(self, item):
+        return str(item.author)
+
+
+class LatestArticlesAtomFeed(LatestArticlesFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestArticlesFeed.description
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index over blog articles."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            indexed = rebuild_index()
+        self.stdout.write(f"Indexed {indexed} articles")
@@ -0,0 +1,36 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from blog.models import Article
+from blog.rendering import render_markdown
+
+
+class Command(BaseCommand):
+    help = "Renders and stores the HTML of articles, spreading the Markdown work over a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Re-render every article, not only those without HTML")
+        parser.add_argument("--workers", type=int, default=os.cpu_count())
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        articles = Article.objects.order_by("pk")
+        if not options["all"]:
+            articles = articles.filter(content_html="")
+        ids = list(articles.values_list("pk", flat=True))
+        batch_size = options["batch_size"]
+
+        rendered = 0
+        with ProcessPoolExecutor(max_workers=options["workers"]) as pool:
+            for start in range(0, len(ids), batch_size):
+                batch = list(Article.objects.filter(pk__in=ids[start:start + batch_size]).values_list("pk", "content"))
+                chunksize = max(1, len(batch) // (options["workers"] * 4))
+                html = pool.map(render_markdown, [content for _, content in batch], chunksize=chunksize)
+                Article.objects.bulk_update(
+                    [Article(pk=pk, content_html=content_html) for (pk, _), content_html in zip(batch, html)],
+                    ["content_html"],
+                )
+                rendered += len(batch)
+                self.stdout.write(f"Rendered {rendered}/{len(ids)} articles")
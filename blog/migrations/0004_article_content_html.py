@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_article_publication_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False, help_text='Sanitized HTML rendered from content on save'),
+        ),
+        migrations.AlterField(
+            model_name='article',
+            name='content',
+            field=models.TextField(help_text='Markdown'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from .rendering import render_markdown
 
 
 class Article(models.Model):
@@ -8,8 +9,22 @@ class Article(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     img = models.URLField(blank=True, null=True)
     summary = models.CharField(max_length=1024, default="")
-    content = models.TextField()
+    content = models.TextField(help_text="Markdown")
+    content_html = models.TextField(blank=True, editable=False, help_text="Sanitized HTML rendered from content on save")
     publication_date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-publication_date", "-id"], name="article_publication_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            self.content_html = render_markdown(self.content)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "content_html"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.title} by {str(self.author)}. Published on {self.publication_date.strftime("%d/%m/%Y %H:%M:%S")}"
@@ -0,0 +1,107 @@
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Article
+
+FTS_TABLE = "blog_article_fts"
+SEARCH_PAGE_SIZE = 10
+# Column weights for bm25(): title, summary, content
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+SNIPPET_TOKENS = 24
+# Private use characters mark highlights so user content can be escaped before adding <mark> tags
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_END = "\ue001"
+
+
+def index_article(article):
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [article.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, summary, content) VALUES (%s, %s, %s, %s)",
+            [article.pk, article.title, article.summary, article.content],
+        )
+
+
+def remove_article(article_id):
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [article_id])
+
+
+def rebuild_index():
+    """Repopulates the full-text index from the articles table, returns the number of indexed articles."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, summary, content) "
+            f"SELECT id, title, summary, content FROM {Article._meta.db_table}"
+        )
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT count(*) FROM {FTS_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def build_match_query(query):
+    """Turns free text into an FTS5 query matching all words.
+
+    Every word is quoted so FTS5 operators and punctuation typed by users cannot
+    produce syntax errors. Prefix queries are deliberately not generated, short
+    prefixes match most of the index and make ranking slow.
+    """
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def _highlight(text):
+    return mark_safe(escape(text).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_END, "</mark>"))
+
+
+class SearchResult:
+    def __init__(self, article, title, snippet, rank):
+        self.article = article
+        self.title = title
+        self.snippet = snippet
+        self.rank = rank
+
+
+class ArticleSearch:
+    """Lazily evaluated, sliceable search results, so it can be handed to a Paginator."""
+
+    def __init__(self, query):
+        self.match = build_match_query(query)
+
+    def count(self):
+        if not self.match:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [self.match])
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, page):
+        if not isinstance(page, slice):
+            raise TypeError("ArticleSearch only supports slicing")
+        if not self.match:
+            return []
+
+        offset = page.start or 0
+        limit = page.stop - offset
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, bm25({FTS_TABLE}, %s, %s, %s) AS rank, "
+                f"highlight({FTS_TABLE}, 0, %s, %s), "
+                f"snippet({FTS_TABLE}, -1, %s, %s, '…', %s) "
+                f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s OFFSET %s",
+                [*RANK_WEIGHTS, HIGHLIGHT_START, HIGHLIGHT_END, HIGHLIGHT_START, HIGHLIGHT_END, SNIPPET_TOKENS,
+                 self.match, limit, offset],
+            )
+            rows = cursor.fetchall()
+
+        articles = Article.objects.select_related("author").only(
+            "title", "img", "publication_date", "author__username"
+        ).in_bulk([row[0] for row in rows])
+        return [
+            SearchResult(articles[pk], _highlight(title), _highlight(snippet), rank)
+            for pk, rank, title, snippet in rows if pk in articles
+        ]
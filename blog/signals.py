@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Article
+from .search import index_article, remove_article
+from .cache import bump_article_version
+
+
+@receiver(post_save, sender=Article)
+def handle_article_saved(sender, instance, **kwargs):
+    index_article(instance)
+    bump_article_version()
+
+
+@receiver(post_delete, sender=Article)
+def handle_article_deleted(sender, instance, **kwargs):
+    remove_article(instance.pk)
+    bump_article_version()
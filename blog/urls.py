@@ -1,7 +1,13 @@
 from django.urls import path
+from globals.feeds import cached_feed
 from . import views
+from .feeds import LatestArticlesFeed, LatestArticlesAtomFeed
+from .cache import get_article_version
 
 urlpatterns = [
     path("articles/<int:article_id>/", views.article, name="article"),
-    path("articles/", views.ArticlesView.as_view(), name="articles")
+    path("articles/", views.ArticlesView.as_view(), name="articles"),
+    path("articles/search/", views.ArticleSearchView.as_view(), name="article_search"),
+    path("articles/feed/rss/", cached_feed(LatestArticlesFeed(), get_article_version), name="articles_rss"),
+    path("articles/feed/atom/", cached_feed(LatestArticlesAtomFeed(), get_article_version), name="articles_atom"),
 ]
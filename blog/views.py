@@ -1,20 +1,58 @@
+import hashlib
 from django.shortcuts import render, get_object_or_404
-from django.views.generic import TemplateView
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.core.paginator import Paginator
+from django.views.generic import TemplateView, ListView
 from .models import Article
+from .search import ArticleSearch, SEARCH_PAGE_SIZE
 from globals.utils import get_tz
 
+ARTICLES_PAGE_SIZE = 12
+
 
 def article(request, article_id):
-    article = get_object_or_404(Article, id=article_id)
+    article = get_object_or_404(Article.objects.select_related("author"), id=article_id)
     tz_name = get_tz(request.user)
-    return render(request, "service/article.html", {"article": article, "tz_info": tz_name})
+
+    # The page also shows who is logged in and their timezone, so those are part of the tag
+    etag = hashlib.md5(
+        f"{article.pk}|{article.title}|{article.author}|{article.img}|{article.publication_date}|"
+        f"{request.user.pk}|{tz_name}|{article.content_html}".encode()
+    ).hexdigest()
+    not_modified = get_conditional_response(request, etag=quote_etag(etag))
+    if not_modified is not None:
+        return not_modified
+
+    response = render(request, "service/article.html", {"article": article, "tz_info": tz_name})
+    response["ETag"] = quote_etag(etag)
+    return response
 
 
-class ArticlesView(TemplateView):
+class ArticlesView(ListView):
     template_name = "service/news.html"
+    context_object_name = "articles"
+    paginate_by = ARTICLES_PAGE_SIZE
+
+    def get_queryset(self):
+        # The list only renders the card, so article bodies are never loaded
+        return Article.objects.select_related("author").only(
+            "title", "summary", "img", "publication_date", "author__username"
+        ).order_by("-publication_date", "-id")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["tz_info"] = get_tz(self.request.user)
+        return context
+
+
+class ArticleSearchView(TemplateView):
+    template_name = "service/article_search.html"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["articles"] = Article.objects.order_by("publication_date").reverse()
+        query = self.request.GET.get("q", "").strip()
+        context["query"] = query
+        context["page"] = Paginator(ArticleSearch(query), SEARCH_PAGE_SIZE).get_page(self.request.GET.get("page"))
         context["tz_info"] = get_tz(self.request.user)
         return context
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Case, F, When
+from django.utils import timezone
+
+from .models import Client
+
+FLUSH_CHUNK_SIZE = 500
+
+
+class LoginBuffer:
+    """Counts logins per user in memory so many logins become one UPDATE per flush.
+
+    Counters lag behind by at most LOGIN_ACTIVITY_FLUSH_INTERVAL seconds in a busy
+    process; buffered logins of a process that dies before flushing are lost.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._logins = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, user_id, when=None):
+        when = when or timezone.now()
+        with self._lock:
+            count, _ = self._logins.get(user_id, (0, None))
+            self._logins[user_id] = (count + 1, when)
+
+    def pending(self):
+        with self._lock:
+            return dict(self._logins)
+
+    def clear(self):
+        with self._lock:
+            self._logins = {}
+
+    def is_due(self):
+        return time.monotonic() - self._last_flush >= settings.LOGIN_ACTIVITY_FLUSH_INTERVAL
+
+    def flush(self):
+        """Applies the buffered counts, returns the number of clients updated."""
+        with self._lock:
+            logins, self._logins = self._logins, {}
+            self._last_flush = time.monotonic()
+        if not logins:
+            return 0
+
+        try:
+            items = list(logins.items())
+            updated = 0
+            for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+                chunk = items[start:start + FLUSH_CHUNK_SIZE]
+                updated += Client.objects.filter(user_id__in=[user_id for user_id, _ in chunk]).update(
+                    logged_in=F("logged_in") + Case(*[When(user_id=user_id, then=count)
+                                                      for user_id, (count, _) in chunk]),
+                    last_seen=Case(*[When(user_id=user_id, then=when) for user_id, (_, when) in chunk]),
+                )
+            return updated
+        except Exception:
+            # Keep the counts for the next flush instead of losing them
+            with self._lock:
+                for user_id, (count, when) in logins.items():
+                    newer_count, newer_when = self._logins.get(user_id, (0, when))
+                    self._logins[user_id] = (count + newer_count, newer_when)
+            raise
+
+    def flush_if_due(self):
+        if self.is_due():
+            return self.flush()
+        return 0
+
+
+login_buffer = LoginBuffer()
@@ -1,9 +1,66 @@
+import io
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.urls import path
 from .models import (ServiceType, Service, Client,
                      Staff, StaffSpecialization,
                      PromoCode, Order, OrderItem,
                      FAQ, Vacancy, About,
-                     PrivacyPolicy)
+                     PrivacyPolicy, normalize_email, normalize_phone)
+from .exports import EXPORTERS, export_response
+from .imports import IMPORTERS, import_csv
+from .lookups import looks_like_phone
+from .forms import CSVImportForm
+
+
+class ExportActionsMixin:
+    """Adds streaming CSV/JSONL export actions, `export_name` selects the exporter."""
+    export_name = None
+
+    def export_csv(self, request, queryset):
+        return export_response(EXPORTERS[self.export_name], queryset.order_by('pk'), 'csv', self.export_name)
+    export_csv.short_description = "Export selected rows as CSV"
+
+    def export_jsonl(self, request, queryset):
+        return export_response(EXPORTERS[self.export_name], queryset.order_by('pk'), 'jsonl', self.export_name)
+    export_jsonl.short_description = "Export selected rows as JSONL"
+
+
+class ImportCSVMixin:
+    """Adds a CSV upload page to the changelist, `import_name` selects the importer."""
+    import_name = None
+    change_list_template = 'admin/import_change_list.html'
+
+    def get_urls(self):
+        opts = self.model._meta
+        urls = [
+            path('import-csv/', self.admin_site.admin_view(self.import_csv_view),
+                 name=f'{opts.app_label}_{opts.model_name}_import_csv'),
+        ]
+        return urls + super().get_urls()
+
+    def import_csv_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        result = None
+        if request.method == 'POST':
+            form = CSVImportForm(request.POST, request.FILES)
+            if form.is_valid():
+                csv_file = io.TextIOWrapper(form.cleaned_data['csv_file'].file, encoding='utf-8-sig', newline='')
+                result = import_csv(IMPORTERS[self.import_name], csv_file, dry_run=form.cleaned_data['dry_run'])
+        else:
+            form = CSVImportForm()
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': f"Import {self.model._meta.verbose_name_plural} from CSV",
+            'form': form,
+            'result': result,
+        }
+        return TemplateResponse(request, 'admin/import_csv.html', context)
 
 
 class OrderItemInline(admin.TabularInline):
@@ -23,31 +80,51 @@ class ServiceTypeAdmin(admin.ModelAdmin):
 
 
 @admin.register(Service)
-class ServiceAdmin(admin.ModelAdmin):
+class ServiceAdmin(ImportCSVMixin, ExportActionsMixin, admin.ModelAdmin):
     list_display = ('name', 'service_type', 'price', 'is_active')
     list_filter = ('service_type', 'is_active')
     search_fields = ('name', 'description', 'notes')
+    export_name = 'services'
+    import_name = 'services'
+    actions = ['export_csv', 'export_jsonl']
 
 
 @admin.register(Client)
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(ImportCSVMixin, ExportActionsMixin, admin.ModelAdmin):
     list_display = ('name', 'client_type', 'contact_number', 'email', 'user', 'user_id')
     list_filter = ('client_type',)
     search_fields = ('name', 'contact_person', 'contact_number', 'email')
     raw_id_fields = ('user',)
+    export_name = 'clients'
+    import_name = 'clients'
+    actions = ['export_csv', 'export_jsonl']
+
+    def get_search_results(self, request, queryset, search_term):
+        # A complete phone number or email is found with the indexed lookup keys instead of a
+        # LIKE scan over every column, partial ones (a domain, a local number) fall back to the scan
+        term = search_term.strip()
+        matches = None
+        if '@' in term:
+            matches = queryset.filter(email_key=normalize_email(term))
+        elif looks_like_phone(term):
+            matches = queryset.filter(phone_key=normalize_phone(term))
+        if matches is not None and matches.exists():
+            return matches, False
+        return super().get_search_results(request, queryset, search_term)
 
 
 @admin.register(Staff)
-class StaffAdmin(admin.ModelAdmin):
+class StaffAdmin(ImportCSVMixin, admin.ModelAdmin):
     list_display = ('user', 'role', 'contact_number', 'hire_date', 'is_active')
     list_filter = ('role', 'is_active')
     search_fields = ('user__username', 'user__first_name', 'user__last_name', 'contact_number')
     inlines = [StaffSpecializationInline]
     raw_id_fields = ('user',)
+    import_name = 'staff'
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(ExportActionsMixin, admin.ModelAdmin):
     list_display = ('order_code', 'client', 'work_date', 'status', 'payment_status', 'total_amount', 'created_by')
     list_filter = ('status', 'payment_status', 'work_date', 'client', 'created_by')
     search_fields = ('order_code', 'client__name', 'address')
@@ -56,8 +133,9 @@ class OrderAdmin(admin.ModelAdmin):
     filter_horizontal = ('assigned_staff',)
     inlines = [OrderItemInline]
     date_hierarchy = 'work_date'
+    export_name = 'orders'
 
-    actions = ['recalculate_totals', 'mark_as_paid']
+    actions = ['recalculate_totals', 'mark_as_paid', 'export_csv', 'export_jsonl']
 
     def recalculate_totals(self, request, queryset):
         for order in queryset:
@@ -0,0 +1,24 @@
+from django.db.models import Avg, Count, Max, Min, Q
+
+from globals.databases import primary
+from globals.single_flight import single_flight
+from .models import ServiceType
+
+SERVICE_TYPE_OVERVIEW_CACHE_KEY = "catalog:service_type_overview"
+SERVICE_TYPE_OVERVIEW_TIMEOUT = 60 * 60
+
+
+@single_flight(SERVICE_TYPE_OVERVIEW_CACHE_KEY, SERVICE_TYPE_OVERVIEW_TIMEOUT)
+def get_service_type_overview():
+    """Service types annotated with service counts and price stats, computed in one query."""
+    return list(primary(ServiceType.objects).annotate(
+        service_count=Count("services"),
+        active_count=Count("services", filter=Q(services__is_active=True)),
+        min_price=Min("services__price"),
+        max_price=Max("services__price"),
+        avg_price=Avg("services__price"),
+    ).order_by("name"))
+
+
+def invalidate_service_type_overview():
+    get_service_type_overview.invalidate()
@@ -0,0 +1,182 @@
+import csv
+import json
+from datetime import datetime, date
+from decimal import Decimal
+from uuid import UUID
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from .models import Order, Client, Service
+
+EXPORT_CHUNK_SIZE = 2000
+# Rows are joined into roughly this many bytes before being handed to the server
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+
+class Echo:
+    """An object that implements just the write method of the file-like interface."""
+
+    def write(self, value):
+        return value
+
+
+def _value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+class Exporter:
+    """Describes how the rows of one model are exported."""
+    model = None
+    header = ()
+
+    def get_queryset(self):
+        return self.model.objects.order_by("pk")
+
+    def prepare(self, queryset):
+        return queryset
+
+    def record(self, obj):
+        raise NotImplementedError
+
+    def rows(self, obj):
+        record = self.record(obj)
+        yield [_value(record[column]) for column in self.header]
+
+
+class ServiceExporter(Exporter):
+    model = Service
+    header = ("id", "name", "service_type", "price", "is_active", "description", "notes")
+
+    def prepare(self, queryset):
+        return queryset.select_related("service_type")
+
+    def record(self, obj):
+        return {
+            "id": obj.pk,
+            "name": obj.name,
+            "service_type": obj.service_type.name,
+            "price": obj.price,
+            "is_active": obj.is_active,
+            "description": obj.description,
+            "notes": obj.notes,
+        }
+
+
+class ClientExporter(Exporter):
+    model = Client
+    header = ("id", "name", "client_type", "contact_person", "contact_number", "email",
+              "address", "timezone", "user_id", "created_at", "updated_at")
+
+    def record(self, obj):
+        return {column: getattr(obj, column) for column in self.header}
+
+
+class OrderExporter(Exporter):
+    """Orders are exported together with their items.
+
+    CSV gets one row per order item (orders without items get a single row
+    with empty item columns), JSONL gets one object per order with nested items.
+    """
+    model = Order
+    order_header = ("order_code", "client_id", "client_name", "address", "work_date", "status",
+                    "payment_status", "total_amount", "promo_code", "created_at")
+    item_header = ("item_service_id", "item_service_name", "item_quantity", "item_price_at_order")
+    header = order_header + item_header
+
+    def prepare(self, queryset):
+        return queryset.select_related("client", "promo_code").prefetch_related("items__service")
+
+    def record(self, obj):
+        return {
+            "order_code": obj.order_code,
+            "client_id": obj.client_id,
+            "client_name": obj.client.name,
+            "address": obj.address,
+            "work_date": obj.work_date,
+            "status": obj.status,
+            "payment_status": obj.payment_status,
+            "total_amount": obj.total_amount,
+            "promo_code": obj.promo_code.code if obj.promo_code else None,
+            "created_at": obj.created_at,
+            "items": [
+                {
+                    "service_id": item.service_id,
+                    "service_name": item.service.name,
+                    "quantity": item.quantity,
+                    "price_at_order": item.price_at_order,
+                }
+                for item in obj.items.all()
+            ],
+        }
+
+    def rows(self, obj):
+        record = self.record(obj)
+        order_row = [_value(record[column]) for column in self.order_header]
+        if not record["items"]:
+            yield order_row + [""] * len(self.item_header)
+        for item in record["items"]:
+            yield order_row + [_value(item["service_id"]), item["service_name"],
+                               item["quantity"], _value(item["price_at_order"])]
+
+
+EXPORTERS = {
+    "orders": OrderExporter(),
+    "clients": ClientExporter(),
+    "services": ServiceExporter(),
+}
+
+
+def _buffered(lines):
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_BUFFER_SIZE:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _csv_lines(exporter, queryset, chunk_size):
+    writer = csv.writer(Echo())
+    yield writer.writerow(exporter.header)
+    for obj in exporter.prepare(queryset).iterator(chunk_size=chunk_size):
+        for row in exporter.rows(obj):
+            yield writer.writerow(row)
+
+
+def _jsonl_lines(exporter, queryset, chunk_size):
+    for obj in exporter.prepare(queryset).iterator(chunk_size=chunk_size):
+        yield json.dumps(exporter.record(obj), cls=DjangoJSONEncoder) + "\n"
+
+
+def stream_export(exporter, queryset, fmt, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yields the export in chunks, never holding more than one chunk of rows in memory."""
+    if fmt == "csv":
+        lines = _csv_lines(exporter, queryset, chunk_size)
+    elif fmt == "jsonl":
+        lines = _jsonl_lines(exporter, queryset, chunk_size)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return _buffered(lines)
+
+
+def export_response(exporter, queryset, fmt, filename):
+    response = StreamingHttpResponse(stream_export(exporter, queryset, fmt), content_type=FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
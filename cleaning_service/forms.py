@@ -56,3 +56,8 @@ OrderItemFormSet = inlineformset_factory(
         "quantity": forms.NumberInput(attrs={"min": 1})
     }
 )
+
+
+class CSVImportForm(forms.Form):
+    csv_file = forms.FileField(help_text="UTF-8 CSV with a header row")
+    dry_run = forms.BooleanField(required=False, help_text="Only validate, do not create anything")
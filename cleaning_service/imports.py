@@ -0,0 +1,213 @@
+import csv
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .models import Service, ServiceType, Client, Staff
+from .quotes import invalidate_price_table
+from .catalog import invalidate_service_type_overview
+
+IMPORT_BATCH_SIZE = 500
+
+User = get_user_model()
+
+
+def cell(row, column):
+    """The stripped value of a column, "" when the row has fewer values than the header."""
+    return (row.get(column) or "").strip()
+
+
+def column_count_error(row):
+    """An error message for a row with more or fewer values than the header, else None.
+
+    csv.DictReader fills missing values with None and collects extra ones under the None key.
+    """
+    expected = sum(1 for column in row if column is not None)
+    found = sum(1 for column, value in row.items() if column is not None and value is not None)
+    found += len(row.get(None, ()))
+    if found != expected:
+        return f"Expected {expected} values, found {found}."
+    return None
+
+
+class ImportResult:
+    """Outcome of an import: how many rows were created and which rows failed."""
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.created = 0
+        self.valid = 0
+        self.errors = []
+
+    def add_error(self, line, field, message):
+        self.errors.append((line, field, message))
+
+    @property
+    def failed_lines(self):
+        return len({line for line, _, _ in self.errors})
+
+
+class Importer:
+    """Builds model instances from CSV rows.
+
+    Rows are processed in batches: foreign keys and unique fields are checked with
+    one query per batch, every row is validated with the model's own validators and
+    the valid ones are inserted with a single bulk_create.
+    """
+    model = None
+    columns = ()
+    required = ()
+    # Fields resolved by the importer itself, skipped by full_clean to avoid per-row queries
+    resolved_fields = ()
+    unique_fields = ()
+
+    def resolve(self, rows):
+        return {}
+
+    def build(self, row, lookups):
+        instance = self.model()
+        for column in self.columns:
+            value = cell(row, column)
+            field = self.model._meta.get_field(column)
+            if value == "":
+                if field.null:
+                    setattr(instance, column, None)
+                continue
+            setattr(instance, column, value)
+        return instance
+
+    def unique_key(self, instance, field):
+        return getattr(instance, self.model._meta.get_field(field).attname)
+
+    def validate(self, instance):
+        instance.full_clean(exclude=self.resolved_fields, validate_unique=False, validate_constraints=False)
+
+    def imported(self):
+        """Called once a batch is committed, bulk_create sends no post_save signals."""
+
+    def run(self, rows, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+        result = ImportResult(dry_run=dry_run)
+        seen = {field: set() for field in self.unique_fields}
+        # The header is line 1, so the first data row is line 2
+        numbered = enumerate(rows, start=2)
+
+        while batch := list(islice(numbered, batch_size)):
+            self._run_batch(batch, seen, result, dry_run)
+
+        return result
+
+    def _run_batch(self, batch, seen, result, dry_run):
+        lookups = self.resolve([row for _, row in batch])
+        candidates = []
+
+        for line, row in batch:
+            error = column_count_error(row)
+            if error:
+                result.add_error(line, "row", error)
+                continue
+            missing = [column for column in self.required if not cell(row, column)]
+            if missing:
+                for column in missing:
+                    result.add_error(line, column, "This field is required.")
+                continue
+            try:
+                instance = self.build(row, lookups)
+                self.validate(instance)
+            except ValidationError as e:
+                for field, messages in e.message_dict.items():
+                    for message in messages:
+                        result.add_error(line, field, message)
+                continue
+            candidates.append((line, instance))
+
+        for field in self.unique_fields:
+            values = [self.unique_key(instance, field) for _, instance in candidates]
+            existing = set(self.model.objects.filter(
+                **{f"{field}__in": [value for value in values if value is not None]}
+            ).values_list(field, flat=True))
+            unique = []
+            for line, instance in candidates:
+                value = self.unique_key(instance, field)
+                if value is not None and (value in existing or value in seen[field]):
+                    result.add_error(line, field, f"{self.model._meta.verbose_name} with this {field} already exists.")
+                    continue
+                seen[field].add(value)
+                unique.append((line, instance))
+            candidates = unique
+
+        result.valid += len(candidates)
+        if not dry_run and candidates:
+            with transaction.atomic():
+                self.model.objects.bulk_create([instance for _, instance in candidates])
+                transaction.on_commit(self.imported)
+            result.created += len(candidates)
+
+
+class ServiceImporter(Importer):
+    model = Service
+    columns = ("name", "description", "price", "notes", "is_active")
+    required = ("service_type", "name", "price")
+    resolved_fields = ("service_type",)
+
+    def resolve(self, rows):
+        names = {cell(row, "service_type") for row in rows}
+        return {"service_types": {st.name: st for st in ServiceType.objects.filter(name__in=names)}}
+
+    def build(self, row, lookups):
+        instance = super().build(row, lookups)
+        name = cell(row, "service_type")
+        if name not in lookups["service_types"]:
+            raise ValidationError({"service_type": f"Unknown service type '{name}'."})
+        instance.service_type = lookups["service_types"][name]
+        return instance
+
+    def imported(self):
+        invalidate_price_table()
+        invalidate_service_type_overview()
+
+
+class ClientImporter(Importer):
+    model = Client
+    columns = ("name", "contact_person", "contact_number", "email", "client_type", "address", "timezone")
+    required = ("name", "contact_number")
+    unique_fields = ("email",)
+
+    def build(self, row, lookups):
+        instance = super().build(row, lookups)
+        # bulk_create skips Client.save()
+        instance.update_lookup_keys()
+        return instance
+
+
+class StaffImporter(Importer):
+    model = Staff
+    columns = ("contact_number", "hire_date", "role", "is_active", "timezone")
+    required = ("username", "hire_date")
+    resolved_fields = ("user",)
+    unique_fields = ("user",)
+
+    def resolve(self, rows):
+        usernames = {cell(row, "username") for row in rows}
+        return {"users": {user.username: user for user in User.objects.filter(username__in=usernames)}}
+
+    def build(self, row, lookups):
+        instance = super().build(row, lookups)
+        username = cell(row, "username")
+        if username not in lookups["users"]:
+            raise ValidationError({"username": f"Unknown user '{username}'."})
+        instance.user = lookups["users"][username]
+        return instance
+
+
+IMPORTERS = {
+    "services": ServiceImporter(),
+    "clients": ClientImporter(),
+    "staff": StaffImporter(),
+}
+
+
+def import_csv(importer, text_stream, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """Streams rows from an open text file into the importer."""
+    return importer.run(csv.DictReader(text_stream), batch_size=batch_size, dry_run=dry_run)
@@ -0,0 +1,49 @@
+from itertools import groupby
+from operator import itemgetter
+
+from django.db.models import Count
+
+from .models import Client, normalize_email, normalize_phone
+
+LOOKUP_LIMIT = 20
+# A search term with at least this many digits and nothing but phone punctuation is a phone number
+MIN_PHONE_DIGITS = 7
+PHONE_CHARACTERS = set("0123456789+-() .")
+
+LOOKUP_KEYS = {
+    "phone": ("phone_key", normalize_phone),
+    "email": ("email_key", normalize_email),
+}
+
+
+def find_clients(phone=None, email=None):
+    """Clients whose normalized phone or email equals the given value, via the lookup indexes."""
+    queryset = Client.objects.none()
+    if phone and normalize_phone(phone):
+        queryset |= Client.objects.filter(phone_key=normalize_phone(phone))
+    if email and normalize_email(email):
+        queryset |= Client.objects.filter(email_key=normalize_email(email))
+    return queryset.order_by("pk")
+
+
+def looks_like_phone(term):
+    return set(term) <= PHONE_CHARACTERS and len(normalize_phone(term)) >= MIN_PHONE_DIGITS
+
+
+def find_duplicate_keys(key):
+    """Yields (value, [client ids]) for every normalized phone or email shared by several clients.
+
+    Runs as a single query: the GROUP BY over the key index finds the shared values and
+    the matching clients are read back in key order.
+    """
+    field, _ = LOOKUP_KEYS[key]
+    shared = (
+        Client.objects.exclude(**{field: ""}).values(field)
+        .annotate(clients=Count("id")).filter(clients__gt=1).values(field)
+    )
+    rows = (
+        Client.objects.filter(**{f"{field}__in": shared}).order_by(field, "pk")
+        .values_list(field, "pk").iterator(chunk_size=10000)
+    )
+    for value, group in groupby(rows, key=itemgetter(0)):
+        yield value, [pk for _, pk in group]
@@ -0,0 +1,74 @@
+import multiprocessing
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+
+
+def _reader(use_replicas, duration, max_order_id, seed):
+    import django
+    django.setup()
+    from django.db import connections
+    from cleaning_service import routers
+    from cleaning_service.models import Order, Service
+
+    if not use_replicas:
+        routers.pin_to_primary()
+    rng = random.Random(seed)
+    reads = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        Order.objects.select_related("client").filter(pk=rng.randint(1, max_order_id)).first()
+        Service.objects.filter(is_active=True).count()
+        reads += 2
+    connections.close_all()
+    return reads
+
+
+def _writer(duration, max_order_id, seed):
+    import django
+    django.setup()
+    from django.db import connections
+    from django.utils import timezone
+    from cleaning_service.models import Order
+
+    rng = random.Random(seed)
+    writes = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        Order.objects.filter(pk=rng.randint(1, max_order_id)).update(updated_at=timezone.now())
+        writes += 1
+    connections.close_all()
+    return writes
+
+
+class Command(BaseCommand):
+    help = "Compares read throughput of reader processes on the primary alone and spread over the replicas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=4, help="Reader processes")
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per configuration")
+        parser.add_argument("--writer", action="store_true", help="Run a process writing to the primary meanwhile")
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("No replicas configured, set DATABASE_REPLICAS and run sync_replicas first")
+        from cleaning_service.models import Order
+        max_order_id = Order.objects.using("default").aggregate(Max("pk"))["pk__max"] or 1
+        duration = options["duration"]
+
+        self.stdout.write(f"{options['processes']} readers, {len(settings.DATABASE_REPLICAS)} replicas, "
+                          f"{duration}s each{', 1 writer' if options['writer'] else ''}")
+        context = multiprocessing.get_context("spawn")
+        for name, use_replicas in (("primary only", False), ("replicas", True)):
+            with context.Pool(options["processes"] + 1) as pool:
+                writer = pool.apply_async(_writer, (duration, max_order_id, 0)) if options["writer"] else None
+                reads = sum(pool.starmap(_reader, [(use_replicas, duration, max_order_id, seed)
+                                                  for seed in range(options["processes"])]))
+                writes = writer.get() if writer else 0
+            summary = f"{name:<14}{reads / duration:>10.0f} reads/s"
+            if writer:
+                summary += f"{writes / duration:>10.0f} writes/s"
+            self.stdout.write(summary)
@@ -0,0 +1,104 @@
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from globals.sqlite import pragma_statements
+
+BENCH_ROWS = 10000
+
+
+def configurations():
+    """(name, pragmas, transaction mode) of every configuration that is compared."""
+    return [
+        ("default", {}, "DEFERRED"),
+        ("wal", {"journal_mode": "WAL"}, "DEFERRED"),
+        ("settings", settings.SQLITE_PRAGMAS, settings.DATABASES["default"].get("OPTIONS", {}).get(
+            "transaction_mode") or "DEFERRED"),
+    ]
+
+
+def _connect(path, pragmas):
+    # Same default timeout as Django's SQLite backend, autocommit so BEGIN is explicit
+    connection = sqlite3.connect(path, timeout=5, isolation_level=None)
+    for statement in pragma_statements(pragmas):
+        connection.execute(statement)
+    return connection
+
+
+def _worker(path, pragmas, transaction_mode, duration, write_ratio, seed):
+    connection = _connect(path, pragmas)
+    rng = random.Random(seed)
+    reads = writes = errors = 0
+    deadline = time.monotonic() + duration
+
+    while time.monotonic() < deadline:
+        row = rng.randrange(1, BENCH_ROWS - 100)
+        try:
+            if rng.random() < write_ratio:
+                connection.execute(f"BEGIN {transaction_mode}")
+                value = connection.execute("SELECT value FROM bench WHERE id = ?", (row,)).fetchone()[0]
+                connection.execute("UPDATE bench SET value = ? WHERE id = ?", (value + 1, row))
+                connection.execute("INSERT INTO bench_log (row_id, created) VALUES (?, ?)", (row, time.time()))
+                connection.execute("COMMIT")
+                writes += 1
+            else:
+                connection.execute("SELECT sum(value) FROM bench WHERE id BETWEEN ? AND ?", (row, row + 100)).fetchone()
+                reads += 1
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            errors += 1
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+
+    connection.close()
+    return reads, writes, errors
+
+
+def _create_database(path, pragmas):
+    connection = _connect(path, pragmas)
+    connection.execute("CREATE TABLE bench (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)")
+    connection.execute("CREATE TABLE bench_log (id INTEGER PRIMARY KEY, row_id INTEGER, created REAL)")
+    connection.execute("BEGIN")
+    connection.executemany("INSERT INTO bench (id, value) VALUES (?, 0)", ((i,) for i in range(1, BENCH_ROWS + 1)))
+    connection.execute("COMMIT")
+    connection.close()
+
+
+class Command(BaseCommand):
+    help = ("Runs a multi-process read/write workload against a scratch SQLite file with the default "
+            "pragmas and with settings.SQLITE_PRAGMAS, reporting throughput and lock errors.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=4)
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per configuration")
+        parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of operations that write")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{options['processes']} processes, {options['duration']}s each, "
+                          f"{options['write_ratio']:.0%} writes")
+        self.stdout.write(f"{'configuration':<14}{'reads/s':>10}{'writes/s':>10}{'lock errors':>13}{'error rate':>12}")
+
+        for name, pragmas, transaction_mode in configurations():
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "bench.sqlite3")
+                _create_database(path, pragmas)
+                arguments = [(path, pragmas, transaction_mode, options["duration"], options["write_ratio"], seed)
+                             for seed in range(options["processes"])]
+                with multiprocessing.get_context("spawn").Pool(options["processes"]) as pool:
+                    results = pool.starmap(_worker, arguments)
+
+            reads = sum(result[0] for result in results)
+            writes = sum(result[1] for result in results)
+            errors = sum(result[2] for result in results)
+            attempts = reads + writes + errors
+            self.stdout.write(
+                f"{name:<14}{reads / options['duration']:>10.0f}{writes / options['duration']:>10.0f}"
+                f"{errors:>13}{errors / attempts if attempts else 0:>12.2%}"
+            )
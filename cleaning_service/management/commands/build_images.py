@@ -0,0 +1,69 @@
+import multiprocessing
+import os
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+
+from globals.images import (RASTER_EXTENSIONS, VARIANTS_PREFIX, available_formats, plan_variants,
+                            render_variant, write_index)
+
+
+def _render(job):
+    source, name, width, fmt, build_dir, force = job
+    return render_variant(source, os.path.join(build_dir, name), width, fmt, force)
+
+
+def find_sources(prefixes):
+    """Maps the static name of every raster image under the prefixes to its file."""
+    sources = {}
+    for finder in finders.get_finders():
+        for name, storage in finder.list([]):
+            name = name.replace(os.sep, "/")
+            if name.startswith(VARIANTS_PREFIX + "/") or os.path.splitext(name)[1].lower() not in RASTER_EXTENSIONS:
+                continue
+            if any(name.startswith(prefix) for prefix in prefixes):
+                # The first finder wins, as with collectstatic
+                sources.setdefault(name, storage.path(name))
+    return sources
+
+
+class Command(BaseCommand):
+    help = ("Renders resized WebP/AVIF variants of the static images in parallel and writes the "
+            "index used by {% responsive_image %}. Run it before collectstatic.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=os.cpu_count(), help="Worker processes")
+        parser.add_argument("--force", action="store_true", help="Render variants that are up to date too")
+
+    def handle(self, *args, **options):
+        formats = available_formats(settings.IMAGE_VARIANT_FORMATS)
+        if not formats:
+            raise CommandError(f"Pillow supports none of {', '.join(settings.IMAGE_VARIANT_FORMATS)}")
+        missing = set(settings.IMAGE_VARIANT_FORMATS) - set(formats)
+        if missing:
+            self.stderr.write(f"Pillow lacks support for {', '.join(sorted(missing))}, skipping")
+
+        sources = find_sources(settings.IMAGE_VARIANT_SOURCES)
+        index, jobs = plan_variants(sources, settings.IMAGE_VARIANT_WIDTHS, formats)
+        build_dir = str(settings.IMAGE_BUILD_DIR)
+
+        started = time.perf_counter()
+        arguments = [(*job, build_dir, options["force"]) for job in jobs]
+        with multiprocessing.get_context("spawn").Pool(max(1, options["processes"])) as pool:
+            results = pool.map(_render, arguments, chunksize=1)
+        write_index(build_dir, index)
+
+        rendered = sum(1 for _, _, was_rendered in results if was_rendered)
+        original_bytes = sum(os.path.getsize(path) for path in sources.values())
+        self.stdout.write(f"{len(sources)} images, {len(results)} variants ({rendered} rendered) "
+                          f"in {time.perf_counter() - started:.1f}s with {options['processes']} processes")
+        self.stdout.write(f"Originals: {original_bytes / 1024:.0f} KiB")
+        for fmt in formats:
+            # Largest variant per image, what a wide screen downloads
+            largest = {name: entry["sources"][fmt][-1][1] for name, entry in index.items()}
+            size = sum(os.path.getsize(os.path.join(build_dir, variant)) for variant in largest.values())
+            self.stdout.write(f"{fmt}: {size / 1024:.0f} KiB at full width")
+        if build_dir not in map(str, settings.STATICFILES_DIRS):
+            self.stdout.write("Restart to add the build directory to STATICFILES_DIRS before collectstatic")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from cleaning_service.exports import EXPORTERS, FORMATS, EXPORT_CHUNK_SIZE, stream_export
+
+
+class Command(BaseCommand):
+    help = "Streams orders, clients or services to a CSV or JSONL file with constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(EXPORTERS))
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument("--output", help="Output file, defaults to stdout")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        exporter = EXPORTERS[options["dataset"]]
+        chunks = stream_export(exporter, exporter.get_queryset(), options["format"], options["chunk_size"])
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as output:
+                for chunk in chunks:
+                    output.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
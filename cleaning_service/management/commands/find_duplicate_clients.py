@@ -0,0 +1,23 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from cleaning_service.lookups import LOOKUP_KEYS, find_duplicate_keys
+
+
+class Command(BaseCommand):
+    help = "Lists clients sharing a normalized phone number or email address."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--by", choices=sorted(LOOKUP_KEYS), action="append",
+                            help="Key to compare, may be repeated (default: phone and email)")
+
+    def handle(self, *args, **options):
+        writer = csv.writer(self.stdout)
+        writer.writerow(("key", "value", "client_ids"))
+        groups = 0
+        for key in options["by"] or sorted(LOOKUP_KEYS):
+            for value, ids in find_duplicate_keys(key):
+                writer.writerow((key, value, " ".join(map(str, ids))))
+                groups += 1
+        self.stderr.write(f"{groups} groups of duplicate clients")
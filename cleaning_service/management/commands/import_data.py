@@ -0,0 +1,39 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand
+
+from cleaning_service.imports import IMPORTERS, IMPORT_BATCH_SIZE, import_csv
+
+
+class Command(BaseCommand):
+    help = "Imports services, clients or staff from a CSV file in validated batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(IMPORTERS))
+        parser.add_argument("csv_file")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate rows without inserting them")
+        parser.add_argument("--report", help="Write the per-row error report to this CSV file")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        with open(options["csv_file"], encoding="utf-8-sig", newline="") as csv_file:
+            result = import_csv(IMPORTERS[options["dataset"]], csv_file,
+                                batch_size=options["batch_size"], dry_run=options["dry_run"])
+        elapsed = time.perf_counter() - started
+
+        if options["report"]:
+            with open(options["report"], "w", encoding="utf-8", newline="") as report:
+                writer = csv.writer(report)
+                writer.writerow(("line", "field", "message"))
+                writer.writerows(result.errors)
+        else:
+            for line, field, message in result.errors:
+                self.stderr.write(f"line {line}: {field}: {message}")
+
+        if result.dry_run:
+            summary = f"Dry run: {result.valid} valid rows"
+        else:
+            summary = f"Imported {result.created} rows"
+        self.stdout.write(f"{summary}, {result.failed_lines} rejected, in {elapsed:.2f}s")
@@ -0,0 +1,41 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = "Copies the primary SQLite database into every replica from settings.DATABASE_REPLICAS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep syncing")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between syncs with --loop")
+
+    def handle(self, *args, **options):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            raise CommandError("No replicas configured, set DATABASE_REPLICAS")
+        for alias in ["default", *replicas]:
+            if connections[alias].vendor != "sqlite":
+                raise CommandError(f"'{alias}' is not an SQLite database, replicate it with the database's own tools")
+
+        while True:
+            started = time.perf_counter()
+            self.sync([settings.DATABASES[alias]["NAME"] for alias in replicas])
+            self.stdout.write(f"Synced {len(replicas)} replicas in {time.perf_counter() - started:.2f}s")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+    def sync(self, replica_paths):
+        # The backup API copies a consistent snapshot while the primary keeps serving writes
+        primary = connections["default"]
+        primary.ensure_connection()
+        for path in replica_paths:
+            target = sqlite3.connect(path)
+            try:
+                primary.connection.backup(target)
+            finally:
+                target.close()
@@ -1,7 +1,16 @@
+import os
+import time
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.storage import storages
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import http_date
 from django.utils import timezone
 import pytz
 from django.contrib.auth.models import User
 from globals.utils import get_tz
+from globals.static_files import collect_static_files
+from . import routers
 
 
 class TimezoneMiddleware:
@@ -18,3 +27,121 @@ class TimezoneMiddleware:
         else:
             timezone.deactivate()
         return self.get_response(request)
+
+
+class ReplicaStickinessMiddleware:
+    """Sends the reads of a client that has just written to the primary database.
+
+    Unsafe requests and requests that write set a cookie holding the time until which
+    the client's reads stay on the primary, covering the replication delay.
+    """
+    cookie_name = "primary_until"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            pinned_until = float(request.COOKIES.get(self.cookie_name, 0))
+        except ValueError:
+            pinned_until = 0
+        unsafe = request.method not in ("GET", "HEAD", "OPTIONS", "TRACE")
+        tokens = routers.start_request(unsafe or pinned_until > time.time())
+        try:
+            response = self.get_response(request)
+            if unsafe or routers.has_written():
+                sticky = settings.REPLICA_STICKY_SECONDS
+                response.set_cookie(self.cookie_name, str(time.time() + sticky), max_age=sticky,
+                                    httponly=True, samesite="Lax")
+        finally:
+            routers.end_request(tokens)
+        return response
+
+
+class StaticFilesMiddleware:
+    """Serves files collected into STATIC_ROOT before the rest of the stack runs.
+
+    Hashed names from the manifest are cached by browsers for good, other names for
+    STATIC_MAX_AGE seconds. Clients get the precompressed .br/.gz sibling they accept.
+    Files up to STATIC_MEMORY_MAX_SIZE bytes are answered from memory, larger ones with
+    FileResponse, which servers providing wsgi.file_wrapper send with sendfile().
+    The files are listed once per process, so in DEBUG the staticfiles app serves
+    them instead and edits show up without a restart.
+    """
+    chunk_size = 64 * 1024
+
+    def __init__(self, get_response):
+        if settings.DEBUG:
+            raise MiddlewareNotUsed("DEBUG is on, static files are served by django.contrib.staticfiles")
+        if not settings.STATIC_ROOT or not os.path.isdir(settings.STATIC_ROOT):
+            raise MiddlewareNotUsed("Nothing collected into STATIC_ROOT")
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        hashed_names = set(getattr(storages["staticfiles"], "hashed_files", {}).values())
+        self.files = collect_static_files(settings.STATIC_ROOT, hashed_names,
+                                          settings.STATIC_MAX_AGE, settings.STATIC_MEMORY_MAX_SIZE)
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and request.path.startswith(self.prefix):
+            static_file = self.files.get(request.path[len(self.prefix):])
+            if static_file is not None:
+                return self.serve(request, static_file)
+        return self.get_response(request)
+
+    def serve(self, request, static_file):
+        encoding = static_file.negotiate(request.headers.get("Accept-Encoding", ""))
+        # Every representation gets its own validator
+        etag = static_file.etag if encoding is None else f'{static_file.etag[:-1]}-{encoding}"'
+        headers = {
+            "Cache-Control": static_file.cache_control,
+            "ETag": etag,
+            "Last-Modified": http_date(static_file.last_modified),
+        }
+        if static_file.encodings:
+            headers["Vary"] = "Accept-Encoding"
+        if etag in [tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")]:
+            return HttpResponse(status=304, headers=headers)
+
+        if encoding is not None:
+            path, size = static_file.encodings[encoding]
+            headers["Content-Encoding"] = encoding
+            return self.respond(request, static_file, encoding, path, 0, size - 1, 200, headers)
+
+        headers["Accept-Ranges"] = "bytes"
+        try:
+            byte_range = static_file.byte_range(request.headers.get("Range", ""))
+        except ValueError:
+            return HttpResponse(status=416, headers={**headers, "Content-Range": f"bytes */{static_file.size}"})
+        if byte_range is None:
+            return self.respond(request, static_file, None, static_file.path, 0, static_file.size - 1, 200, headers)
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{static_file.size}"
+        return self.respond(request, static_file, None, static_file.path, start, end, 206, headers)
+
+    def respond(self, request, static_file, encoding, path, start, end, status, headers):
+        headers["Content-Length"] = str(end - start + 1)
+        content_type = static_file.content_type
+        if request.method == "HEAD":
+            return HttpResponse(status=status, content_type=content_type, headers=headers)
+        content = static_file.contents.get(encoding)
+        if content is not None:
+            body = content if status == 200 else content[start:end + 1]
+            return HttpResponse(body, status=status, content_type=content_type, headers=headers)
+        if status == 200:
+            response = FileResponse(open(path, "rb"), content_type=content_type, headers=headers)
+            # FileResponse names the file inline, which would offer .gz siblings under their own name
+            del response["Content-Disposition"]
+            return response
+        return StreamingHttpResponse(self.read_range(path, start, end), status=status,
+                                     content_type=content_type, headers=headers)
+
+    def read_range(self, path, start, end):
+        with open(path, "rb") as file:
+            file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
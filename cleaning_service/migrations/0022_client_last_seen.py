@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:04
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning_service', '0021_merge_20250915_1108'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='last_seen',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='faq',
+            name='answer_date',
+            field=models.DateTimeField(default=datetime.datetime(2026, 10, 19, 14, 4, 24, 400156, tzinfo=datetime.timezone.utc)),
+        ),
+    ]
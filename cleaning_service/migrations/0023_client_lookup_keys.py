@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:05
+
+import datetime
+from django.db import migrations, models
+
+from cleaning_service.models import normalize_email, normalize_phone
+
+BATCH_SIZE = 5000
+
+
+def fill_lookup_keys(apps, schema_editor):
+    Client = apps.get_model('cleaning_service', 'Client')
+    table = schema_editor.quote_name(Client._meta.db_table)
+    last_pk = 0
+    with schema_editor.connection.cursor() as cursor:
+        while True:
+            rows = list(Client.objects.filter(pk__gt=last_pk).order_by('pk')
+                        .values_list('pk', 'contact_number', 'email')[:BATCH_SIZE])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            cursor.executemany(
+                f'UPDATE {table} SET phone_key = %s, email_key = %s WHERE id = %s',
+                [(normalize_phone(phone), normalize_email(email), pk) for pk, phone, email in rows],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleaning_service', '0022_client_last_seen'),
+    ]
+
+    # The keys are filled before their indexes exist, so the backfill does not maintain them row by row
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='email_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='phone_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=20),
+        ),
+        migrations.RunPython(fill_lookup_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='client',
+            name='email_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=254),
+        ),
+        migrations.AlterField(
+            model_name='client',
+            name='phone_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='faq',
+            name='answer_date',
+            field=models.DateTimeField(default=datetime.datetime(2026, 10, 19, 14, 5, 57, 871880, tzinfo=datetime.timezone.utc)),
+        ),
+    ]
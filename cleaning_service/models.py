@@ -3,11 +3,24 @@ from decimal import Decimal
 from django.conf import settings
 from django.core.validators import MinValueValidator, RegexValidator
 from django.utils import timezone
+from globals.query_cache import CachingManager
 import uuid
 
 phone_number_validator = RegexValidator(r"^\+375(:?44|29|33)\d{7}$")
 
 
+def normalize_phone(value):
+    """Reduces a phone number to its digits in international form, "8 029 ..." becomes "37529..."."""
+    digits = "".join(char for char in value or "" if char.isdigit())
+    if len(digits) == 11 and digits.startswith("80"):
+        digits = "375" + digits[2:]
+    return digits
+
+
+def normalize_email(value):
+    return (value or "").strip().lower()
+
+
 # --- Service Related Models ---
 
 
@@ -16,6 +29,8 @@ class ServiceType(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True, null=True)
 
+    objects = CachingManager()
+
     def __str__(self):
         return self.name
 
@@ -54,11 +69,27 @@ class Client(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     timezone = models.CharField(max_length=30, default="UTC")
+    # Maintained in batches by cleaning_service.activity, may lag behind by a few seconds
     logged_in = models.IntegerField(default=0)
+    last_seen = models.DateTimeField(blank=True, null=True)
+    # Normalized copies of contact_number and email for exact, indexed lookups
+    phone_key = models.CharField(max_length=20, blank=True, default="", editable=False, db_index=True)
+    email_key = models.CharField(max_length=254, blank=True, default="", editable=False, db_index=True)
 
     def __str__(self):
         return self.name
 
+    def update_lookup_keys(self):
+        self.phone_key = normalize_phone(self.contact_number)
+        self.email_key = normalize_email(self.email)
+
+    def save(self, *args, **kwargs):
+        self.update_lookup_keys()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"contact_number", "email"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "phone_key", "email_key"}
+        super().save(*args, **kwargs)
+
 
 class Staff(models.Model):
     """Represents a staff member."""
@@ -110,6 +141,13 @@ class PromoCode(models.Model):
         null=True, blank=True, help_text="Maximum number of times this code can be used overall")
     used_count = models.PositiveIntegerField(default=0)
 
+    objects = CachingManager()
+
+    def apply_discount(self, total):
+        if self.discount_type == self.DiscountType.FIXED:
+            return total - self.value
+        return total - total * self.value / 100
+
     def __str__(self):
         if self.discount_type == self.DiscountType.PERCENTAGE:
             return f"{self.code} ({self.value}%)"
@@ -158,10 +196,7 @@ class Order(models.Model):
         total = sum(item.price_at_order * item.quantity for item in self.items.all())
 
         if self.promo_code:
-            if self.promo_code.discount_type == self.promo_code.DiscountType.FIXED:
-                total -= self.promo_code.value
-            else:
-                total -= total * self.promo_code.value / 100
+            total = self.promo_code.apply_discount(total)
 
         return max(total, Decimal(0.0))
 
@@ -201,6 +236,8 @@ class FAQ(models.Model):
     answer = models.CharField(max_length=256)
     answer_date = models.DateTimeField(default=timezone.now())
 
+    objects = CachingManager()
+
     def __str__(self):
         return f"Q: {self.question}\nA: {self.answer}"
 
@@ -211,6 +248,8 @@ class Vacancy(models.Model):
     job_description = models.TextField()
     job_type = models.ForeignKey(ServiceType, on_delete=models.SET_NULL, null=True, blank=True)
 
+    objects = CachingManager()
+
     def __str__(self):
         return self.job_title
 
@@ -0,0 +1,107 @@
+from decimal import Decimal, InvalidOperation
+
+from django.core.cache import cache
+
+from globals.databases import primary
+from .models import Service, PromoCode
+
+PRICE_TABLE_CACHE_KEY = "quotes:price_table"
+PRICE_TABLE_TIMEOUT = 60 * 60
+MAX_CARTS_PER_REQUEST = 100
+CENTS = Decimal("0.01")
+
+
+class QuoteError(ValueError):
+    pass
+
+
+def get_price_table():
+    """Maps the id of every active service to its current price."""
+    table = cache.get(PRICE_TABLE_CACHE_KEY)
+    if table is None:
+        table = dict(primary(Service.objects.filter(is_active=True)).values_list("id", "price"))
+        cache.set(PRICE_TABLE_CACHE_KEY, table, PRICE_TABLE_TIMEOUT)
+    return table
+
+
+def invalidate_price_table():
+    cache.delete(PRICE_TABLE_CACHE_KEY)
+
+
+def _parse_items(items):
+    if not isinstance(items, list) or not items:
+        raise QuoteError("A cart needs at least one item")
+
+    quantities = {}
+    for item in items:
+        try:
+            service_id = int(item["service"])
+            quantity = int(item.get("quantity", 1))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise QuoteError("Every item needs an integer 'service' and 'quantity'")
+        if quantity < 1:
+            raise QuoteError("Quantity must be at least 1")
+        if service_id in quantities:
+            raise QuoteError(f"Service {service_id} appears more than once")
+        quantities[service_id] = quantity
+    return quantities
+
+
+def quote_cart(cart, price_table, promo_codes):
+    """Prices a single cart with the same rules as Order.calculate_total()."""
+    if not isinstance(cart, dict):
+        raise QuoteError("A cart must be an object")
+
+    quantities = _parse_items(cart.get("items"))
+    lines = []
+    for service_id, quantity in quantities.items():
+        if service_id not in price_table:
+            raise QuoteError(f"Unknown or inactive service {service_id}")
+        price = price_table[service_id]
+        lines.append({"service": service_id, "quantity": quantity, "price": price, "amount": price * quantity})
+
+    subtotal = sum(line["amount"] for line in lines)
+    total = subtotal
+
+    code = cart.get("promo_code")
+    if code is not None and not isinstance(code, str):
+        raise QuoteError("Promo code must be a string")
+    if code:
+        if code not in promo_codes:
+            raise QuoteError(f"Promo code '{code}' is expired or invalid")
+        total = promo_codes[code].apply_discount(total)
+
+    total = max(total, Decimal(0.0))
+
+    try:
+        return {
+            "items": [{**line, "price": str(line["price"]), "amount": str(line["amount"])} for line in lines],
+            "promo_code": code or None,
+            "subtotal": str(subtotal.quantize(CENTS)),
+            "discount": str((subtotal - total).quantize(CENTS)),
+            "total": str(total.quantize(CENTS)),
+        }
+    except InvalidOperation:
+        raise QuoteError("Cart total is out of range")
+
+
+def quote_carts(carts):
+    """Prices many carts with one price table lookup and one promo code query.
+
+    Invalid carts do not fail the whole batch, their entry holds an 'error' instead.
+    """
+    if len(carts) > MAX_CARTS_PER_REQUEST:
+        raise QuoteError(f"At most {MAX_CARTS_PER_REQUEST} carts can be quoted at once")
+
+    price_table = get_price_table()
+    codes = {cart["promo_code"] for cart in carts
+             if isinstance(cart, dict) and isinstance(cart.get("promo_code"), str)}
+    promo_codes = {promo.code: promo for promo in PromoCode.objects.filter(code__in=codes, is_active=True)} if codes else {}
+
+    quotes = []
+    for cart in carts:
+        try:
+            quotes.append(quote_cart(cart, price_table, promo_codes))
+        except QuoteError as e:
+            quotes.append({"error": str(e)})
+    return quotes
@@ -0,0 +1,72 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = "default"
+
+_pinned = ContextVar("pinned_to_primary", default=False)
+_wrote = ContextVar("wrote_to_primary", default=False)
+
+
+def pin_to_primary():
+    _pinned.set(True)
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def record_write():
+    _wrote.set(True)
+    _pinned.set(True)
+
+
+def has_written():
+    return _wrote.get()
+
+
+def start_request(pinned):
+    """Resets the routing state for a new request, returns tokens for end_request()."""
+    return _pinned.set(pinned), _wrote.set(False)
+
+
+def end_request(tokens):
+    pinned_token, wrote_token = tokens
+    _pinned.reset(pinned_token)
+    _wrote.reset(wrote_token)
+
+
+class PrimaryReplicaRouter:
+    """Writes go to the primary, reads to a random replica from settings.DATABASE_REPLICAS.
+
+    After a save or delete, reads stay on the primary for the rest of the request (and,
+    once the write commits, for REPLICA_STICKY_SECONDS afterwards through
+    ReplicaStickinessMiddleware) so users see their own changes even when the replicas
+    lag behind. Routing a write alone records nothing: get_or_create() asks for the
+    write database before it knows whether it will write.
+
+    Writes are seen through post_save/post_delete only. QuerySet.update(), bulk_create()
+    and raw SQL send no signals, so code writing that way in a safe request (GET, HEAD)
+    must call pin_to_primary() and, once committed, record_write() itself; unsafe
+    requests are pinned by ReplicaStickinessMiddleware anyway.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or is_pinned():
+            return PRIMARY
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary made by `sync_replicas`
+        return db == PRIMARY
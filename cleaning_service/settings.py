@@ -56,6 +56,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'cleaning_service.middleware.StaticFilesMiddleware',
+    'cleaning_service.middleware.ReplicaStickinessMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -94,9 +96,62 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Take the write lock when a transaction starts instead of failing to upgrade a read lock
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Read replicas: DATABASE_REPLICAS=replica1.sqlite3,replica2.sqlite3 adds one alias per file.
+# Replicas of SQLite files are refreshed from the primary with `manage.py sync_replicas`.
+DATABASE_REPLICAS = []
+for number, name in enumerate(filter(None, os.environ.get('DATABASE_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'NAME': BASE_DIR / name.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['cleaning_service.routers.PrimaryReplicaRouter']
+# Seconds a client keeps reading from the primary after writing
+REPLICA_STICKY_SECONDS = 5
+
+# Applied to every new SQLite connection by globals.sqlite.apply_pragmas.
+# busy_timeout (ms) makes writers wait instead of raising "database is locked",
+# synchronous=NORMAL avoids an fsync per commit.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'synchronous': 'NORMAL',
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+# SQLITE_WAL=1 lets readers run next to the writer. WAL is written into the database file,
+# so it is opt-in: otherwise every manage.py command would rewrite the committed db.sqlite3.
+if os.environ.get('SQLITE_WAL') == '1':
+    SQLITE_PRAGMAS['journal_mode'] = 'WAL'
+
+# REDIS_URL (e.g. redis://localhost:6379/1, needs the redis package) gives all workers one
+# shared cache; without it every process caches in its own memory.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds results of CachingQuerySet.cached() are kept, changes invalidate them earlier
+QUERY_CACHE_TIMEOUT = 60 * 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -116,6 +171,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: the first hasher is compatible with Django's default PBKDF2 hashes.
+# PASSWORD_HASHING_POOL is 'thread', 'process' or None to hash in the request thread.
+PASSWORD_HASHERS = [
+    'users.hashers.PooledPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+PASSWORD_HASH_ITERATIONS = 1_000_000
+PASSWORD_HASHING_POOL = 'thread'
+PASSWORD_HASHING_WORKERS = 2
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -138,6 +206,34 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / "static"]
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+# StaticFilesMiddleware: seconds browsers keep files without a hash in their name,
+# and files up to this many bytes are answered from memory
+STATIC_MAX_AGE = 60
+STATIC_MEMORY_MAX_SIZE = 256 * 1024
+
+# collectstatic stores files under content-hashed names that can be cached for good
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'globals.storage.ManifestStaticStorage',
+    },
+}
+
+# Resized WebP/AVIF copies of static images, written by `manage.py build_images` before
+# collectstatic and picked by browsers through the {% responsive_image %} tag
+IMAGE_BUILD_DIR = BASE_DIR / 'build' / 'static'
+IMAGE_VARIANT_SOURCES = ['images/']
+IMAGE_VARIANT_WIDTHS = [160, 320, 640, 1280, 1920]
+IMAGE_VARIANT_FORMATS = ['avif', 'webp']
+if IMAGE_BUILD_DIR.exists():
+    STATICFILES_DIRS.append(IMAGE_BUILD_DIR)
+
+# Uploaded and generated files, client archives are only served through authenticated views
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -152,6 +248,14 @@ AUTHENTICATION_BACKENDS = [
     'allauth.account.auth_backends.AuthenticationBackend',
 ]
 
+# Review moderation: a class with score_batch(reviews) returning spam probabilities,
+# reviews scoring at or above the threshold are rejected
+REVIEW_MODERATION_SCORER = 'reviews.moderation.KeywordScorer'
+REVIEW_MODERATION_THRESHOLD = 0.5
+
+# Seconds between flushes of the buffered Client.logged_in/last_seen updates
+LOGIN_ACTIVITY_FLUSH_INTERVAL = 5
+
 SITE_ID = 2
 ACCOUNT_EMAIL_VERIFICATION = 'none'
 ACCOUNT_LOGIN_METHODS = {'email'}
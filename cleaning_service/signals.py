@@ -1,10 +1,77 @@
-from django.db.models.signals import post_save
+import logging
+
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Client
+from django.contrib.auth.signals import user_logged_in
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.db.backends.signals import connection_created
+from . import routers
+from .models import FAQ, Client, PromoCode, Service, ServiceType, Vacancy
+from .quotes import invalidate_price_table
+from .catalog import invalidate_service_type_overview
+from .activity import login_buffer
+from globals.sqlite import apply_pragmas
+from globals.query_cache import invalidate_on_change
+
+logger = logging.getLogger(__name__)
 
 
 @receiver(post_save, sender=User)
 def handle_client_profile(sender, instance, created, **kwargs):
-    if created:
+    # Signup creates a fully populated profile itself in the same transaction
+    if created and not getattr(instance, "_skip_client_profile", False):
         Client.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def handle_service_change(sender, instance, **kwargs):
+    invalidate_price_table()
+    invalidate_service_type_overview()
+
+
+@receiver(post_save, sender=ServiceType)
+@receiver(post_delete, sender=ServiceType)
+def handle_service_type_change(sender, instance, **kwargs):
+    invalidate_service_type_overview()
+
+
+for model in (FAQ, PromoCode, ServiceType, Vacancy):
+    post_save.connect(invalidate_on_change, sender=model)
+    post_delete.connect(invalidate_on_change, sender=model)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def record_database_write(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    # Later reads of this request must see the change even before it commits,
+    # the client only stays on the primary for writes that actually commit.
+    # Bulk writes send no signals, see PrimaryReplicaRouter.
+    routers.pin_to_primary()
+    transaction.on_commit(routers.record_write, using=using)
+
+
+@receiver(user_logged_in)
+def handle_login(sender, request, user, **kwargs):
+    login_buffer.record(user.pk)
+
+
+@receiver(request_finished)
+def flush_login_activity(sender, **kwargs):
+    # Runs after close_old_connections(), so a connection opened by the flush is closed here
+    opened = connection.connection is None
+    try:
+        login_buffer.flush_if_due()
+    except Exception:
+        # The response has been sent already, the buffer keeps the counts for the next flush
+        logger.exception("Flushing login activity failed")
+    finally:
+        if opened:
+            connection.close()
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    apply_pragmas(connection)
@@ -0,0 +1,37 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from globals.images import FORMAT_PREFERENCE, load_index
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(name, alt="", sizes="100vw", **attrs):
+    """<picture> with AVIF/WebP srcsets of a static image and the original as fallback.
+
+    `sizes` tells the browser how wide the image is displayed so it can pick a variant,
+    other keyword arguments become attributes of the <img>. Without a variants index
+    (build_images has not run) this is a plain <img>.
+    """
+    img = format_html(
+        "<img src=\"{}\" alt=\"{}\"{}>",
+        static(name),
+        alt,
+        format_html_join("", " {}=\"{}\"", attrs.items()),
+    )
+    entry = load_index(settings.IMAGE_BUILD_DIR).get(name)
+    if not entry:
+        return img
+
+    sources = format_html_join(
+        "",
+        "<source type=\"image/{}\" srcset=\"{}\" sizes=\"{}\">",
+        (
+            (fmt, ", ".join(f"{static(variant)} {width}w" for width, variant in entry["sources"][fmt]), sizes)
+            for fmt in FORMAT_PREFERENCE if fmt in entry["sources"]
+        ),
+    )
+    return format_html("<picture>{}{}</picture>", sources, img)
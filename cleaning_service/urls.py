@@ -30,14 +30,18 @@ urlpatterns = [
     path("certificate/", views.certificate, name="certificate"),
     path("table_test/", views.table_test, name="table_test"),
     path("privacy_policy/", views.privacy_policy, name="privacy_policy"),
+    path("timezones/", views.timezone_lookup, name="timezones"),
     path("cat_fact/", views.CatFactView.as_view(), name="cat_fact"),
     path("promo/", views.PromoCodeView.as_view(), name="promo_codes"),
     path("service_types/", views.ServiceTypeView.as_view(), name="service_types"),
     path("services/", views.ServiceView.as_view(), name="services"),
     path("orders/", views.OrderView.as_view(), name="orders"),
     path("orders/create/", views.AddOrderView.as_view(), name="order_create"),
+    path("orders/quote/", views.QuoteView.as_view(), name="order_quote"),
     path("orders/edit/<int:order_id>/", views.UpdateOrderView.as_view(), name="order_edit"),
     path("orders/delete/<int:order_id>/", views.DeleteOrderView.as_view(), name="order_delete"),
+    path("clients/lookup/", views.ClientLookupView.as_view(), name="client_lookup"),
+    path("exports/<str:dataset>.<str:fmt>", views.ExportView.as_view(), name="export"),
     path("", include("users.urls")),
     path("oauth/", include("allauth.urls")),
     path("", include("blog.urls")),
@@ -1,15 +1,25 @@
 from django.shortcuts import render, redirect
+from django.http import Http404, JsonResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.csrf import csrf_exempt
 from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.views.generic import TemplateView, ListView, CreateView, DeleteView, UpdateView
+from django.views.generic import View, TemplateView, ListView, CreateView, DeleteView, UpdateView
 from django.db.models import Q
-from blog.models import Article
-from .models import FAQ, Vacancy, About, PrivacyPolicy, PromoCode, ServiceType, Service, Order, OrderItem, Client
+from blog.cache import get_latest_article
+from reviews.models import RatingSummary
+from .models import FAQ, Vacancy, About, PrivacyPolicy, PromoCode, Service, Order, OrderItem, Client
 from .filters import ServiceFilter
 from globals.logging import LoggingMixin
 from globals.utils import get_tz
+from globals.timezones import search_timezones
 from django_filters.views import FilterView
 from .forms import OrderItemFormSet, OrderForm
+from .exports import EXPORTERS, FORMATS, export_response
+from .quotes import QuoteError, quote_carts
+from .catalog import get_service_type_overview
+from .lookups import LOOKUP_LIMIT, find_clients
 
 import json
 import requests
@@ -27,7 +37,8 @@ def index(request):
     except Exception:
         ip = "Unable to connect to server :("
 
-    return render(request, "service/index.html", {"article": Article.objects.last(), "ip": ip, "tz_info": get_tz(request.user)})
+    return render(request, "service/index.html", {"article": get_latest_article(), "ip": ip, "tz_info": get_tz(request.user),
+                                                  "rating_summary": RatingSummary.get()})
 
 
 def privacy_policy(request):
@@ -51,17 +62,23 @@ def table_test(request):
 
 
 def faq(request):
-    return render(request, "service/faq.html", {"faqs": FAQ.objects.all(), "tz_info": get_tz(request.user)})
+    return render(request, "service/faq.html", {"faqs": FAQ.objects.all().cached(), "tz_info": get_tz(request.user)})
 
 
 def vacancies(request):
-    return render(request, "service/vacancies.html", {"vacancies": Vacancy.objects.all(), "tz_info": get_tz(request.user)})
+    return render(request, "service/vacancies.html", {"vacancies": Vacancy.objects.select_related("job_type").cached(), "tz_info": get_tz(request.user)})
 
 
 def about(request):
     return render(request, "service/about.html", {"about": About.objects.last(), "tz_info": get_tz(request.user)})
 
 
+# The timezone list only changes with pytz upgrades, browsers and proxies may keep answers for a day
+@cache_control(public=True, max_age=60 * 60 * 24)
+def timezone_lookup(request):
+    return JsonResponse({"results": search_timezones(request.GET.get("q", "")[:50])})
+
+
 class CatFactView(LoggingMixin, TemplateView):
     template_name = "service/cat_fact.html"
 
@@ -89,8 +106,8 @@ class PromoCodeView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["tz_info"] = get_tz(self.request.user)
-        context["valid_codes"] = PromoCode.objects.filter(is_active=True)
-        context["invalid_codes"] = PromoCode.objects.filter(is_active=False)
+        context["valid_codes"] = PromoCode.objects.filter(is_active=True).cached()
+        context["invalid_codes"] = PromoCode.objects.filter(is_active=False).cached()
         return context
 
 
@@ -100,7 +117,7 @@ class ServiceTypeView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["tz_info"] = get_tz(self.request.user)
-        context["service_types"] = ServiceType.objects.filter()
+        context["service_types"] = get_service_type_overview()
         return context
 
 
@@ -251,3 +268,69 @@ class DeleteOrderView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
 
     def test_func(self):
         return self.get_object().client.user == self.request.user or self.request.user.is_superuser
+
+
+class ExportView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Streams a full export of orders, clients or services as CSV or JSONL."""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, dataset, fmt):
+        if dataset not in EXPORTERS or fmt not in FORMATS:
+            raise Http404("Unknown export")
+        exporter = EXPORTERS[dataset]
+        return export_response(exporter, exporter.get_queryset(), fmt, dataset)
+
+
+class ClientLookupView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Exact match on the normalized phone number or email for the call center."""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request):
+        phone = request.GET.get("phone", "")
+        email = request.GET.get("email", "")
+        if not phone and not email:
+            return JsonResponse({"error": "Pass a phone or an email parameter"}, status=HTTPStatus.BAD_REQUEST)
+
+        clients = find_clients(phone=phone, email=email).only(
+            "name", "contact_person", "contact_number", "email", "client_type"
+        )[:LOOKUP_LIMIT]
+        return JsonResponse({"results": [
+            {
+                "id": client.pk,
+                "name": client.name,
+                "contact_person": client.contact_person,
+                "contact_number": client.contact_number,
+                "email": client.email,
+                "client_type": client.client_type,
+            }
+            for client in clients
+        ]})
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class QuoteView(View):
+    """Prices one cart ({"items": [...], "promo_code": ...}) or many ({"carts": [...]}) without creating orders."""
+
+    def post(self, request):
+        try:
+            payload = json.loads(request.body)
+        except (ValueError, UnicodeDecodeError):
+            return JsonResponse({"error": "Request body must be JSON"}, status=HTTPStatus.BAD_REQUEST)
+        if not isinstance(payload, dict):
+            return JsonResponse({"error": "Request body must be an object"}, status=HTTPStatus.BAD_REQUEST)
+
+        if "carts" in payload:
+            if not isinstance(payload["carts"], list):
+                return JsonResponse({"error": "'carts' must be a list"}, status=HTTPStatus.BAD_REQUEST)
+            try:
+                return JsonResponse({"quotes": quote_carts(payload["carts"])})
+            except QuoteError as e:
+                return JsonResponse({"error": str(e)}, status=HTTPStatus.BAD_REQUEST)
+
+        quote = quote_carts([payload])[0]
+        status = HTTPStatus.BAD_REQUEST if "error" in quote else HTTPStatus.OK
+        return JsonResponse(quote, status=status)
@@ -1,3 +1,15 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ClientJob
+
+
+@admin.register(ClientJob)
+class ClientJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'client', 'user', 'done', 'created_at', 'finished_at')
+    list_filter = ('kind', 'status')
+    raw_id_fields = ('client', 'user')
+    readonly_fields = ('done', 'progress', 'total', 'created_at', 'started_at', 'finished_at', 'error')
+
+    @admin.display(description='Done')
+    def done(self, job):
+        return f"{job.percent_done}%"
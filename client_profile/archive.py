@@ -0,0 +1,102 @@
+import json
+import zipfile
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from blog.models import Article
+from cleaning_service.exports import EXPORT_CHUNK_SIZE, EXPORTERS, Exporter, stream_export
+from reviews.models import Review
+
+# Compressed bytes are handed to the response once roughly this much has accumulated
+ARCHIVE_BUFFER_SIZE = 64 * 1024
+
+
+class ReviewExporter(Exporter):
+    model = Review
+    header = ("id", "title", "content", "score", "status", "publication_date")
+
+    def record(self, obj):
+        return {column: getattr(obj, column) for column in self.header}
+
+
+class ArticleExporter(Exporter):
+    model = Article
+    header = ("id", "title", "summary", "content", "img", "publication_date")
+
+    def record(self, obj):
+        return {column: getattr(obj, column) for column in self.header}
+
+
+class ZipBuffer:
+    """Write-only file object collecting what ZipFile writes until it is drained.
+
+    It has no tell() or seek(), so ZipFile writes sizes and CRCs in data descriptors
+    after each entry instead of seeking back, and never needs the archive in memory.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        self.size = 0
+        return data
+
+
+def archive_entries(client):
+    """(file name, format, exporter, queryset) of every file in the client's archive."""
+    entries = [
+        ("orders.csv", "csv", EXPORTERS["orders"], client.orders.order_by("pk")),
+    ]
+    if client.user_id:
+        entries += [
+            ("reviews.csv", "csv", ReviewExporter(), Review.objects.filter(author_id=client.user_id).order_by("pk")),
+            ("articles.jsonl", "jsonl", ArticleExporter(), Article.objects.filter(author_id=client.user_id).order_by("pk")),
+        ]
+    return entries
+
+
+def profile_record(client):
+    record = EXPORTERS["clients"].record(client)
+    user = client.user
+    if user is not None:
+        record["account"] = {
+            "username": user.username,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "date_joined": user.date_joined,
+            "last_login": user.last_login,
+        }
+    return record
+
+
+def stream_client_archive(client, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yields a ZIP archive of everything stored about the client, one compressed chunk at a time."""
+    buffer = ZipBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("profile.json", json.dumps(profile_record(client), cls=DjangoJSONEncoder, indent=2))
+
+        for name, fmt, exporter, queryset in archive_entries(client):
+            with archive.open(name, "w", force_zip64=True) as entry:
+                for block in stream_export(exporter, queryset, fmt, chunk_size):
+                    entry.write(block.encode())
+                    if buffer.size >= ARCHIVE_BUFFER_SIZE:
+                        yield buffer.drain()
+            yield buffer.drain()
+
+    yield buffer.drain()
+
+
+def archive_filename(client):
+    return f"client-{client.pk}-data.zip"
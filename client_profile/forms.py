@@ -1,9 +1,11 @@
-import pytz
 from django import forms
 from cleaning_service.models import Client
+from globals.timezones import TimezoneField
 
 
 class ClientForm(forms.ModelForm):
+    timezone = TimezoneField()
+
     class Meta:
         model = Client
         fields = [
@@ -18,7 +20,6 @@ class ClientForm(forms.ModelForm):
         widgets = {
             'address': forms.Textarea(attrs={'rows': 3, 'placeholder': 'Enter full address'}),
             'contact_number': forms.TextInput(attrs={'placeholder': '+1234567890'}),
-            'timezone': forms.Select(choices=[(tz, tz) for tz in pytz.common_timezones])
         }
 
     def __init__(self, *args, **kwargs):
@@ -0,0 +1,112 @@
+import tempfile
+import traceback
+from functools import partial
+
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from blog.models import Article
+from cleaning_service.models import Order
+from reviews.models import Review
+from .archive import archive_filename, stream_client_archive
+from .models import ClientJob
+
+PURGE_CHUNK_SIZE = 1000
+
+
+def run_export(job):
+    if job.client is None:
+        raise ValueError("The client of this job no longer exists")
+    # The archive is spooled to a temporary file, never held in memory
+    with tempfile.TemporaryFile() as archive:
+        for chunk in stream_client_archive(job.client):
+            archive.write(chunk)
+        archive.seek(0)
+        job.result.save(archive_filename(job.client), File(archive), save=False)
+
+
+def purge_querysets(client, user):
+    """Rows owned by the account. Deleting a chunk of orders also deletes their items with one DELETE."""
+    querysets = []
+    if client is not None:
+        querysets.append(Order.objects.filter(client=client))
+    if user is not None:
+        querysets += [Review.objects.filter(author=user), Article.objects.filter(author=user)]
+    return querysets
+
+
+def export_jobs(client, user):
+    """The account's data exports, whose archives hold a copy of everything purged."""
+    owners = Q()
+    if client is not None:
+        owners |= Q(client=client)
+    if user is not None:
+        owners |= Q(user=user)
+    if not owners:
+        return ClientJob.objects.none()
+    return ClientJob.objects.filter(owners, kind=ClientJob.Kind.EXPORT)
+
+
+def run_purge(job, chunk_size=PURGE_CHUNK_SIZE):
+    """Deletes an account's rows in short transactions of at most `chunk_size` rows each.
+
+    Deleting the user at once makes Django's collector load every related object into
+    memory and hold the write lock until all of them are gone. Export jobs go too,
+    their archive files once the rows are deleted.
+    """
+    querysets = purge_querysets(job.client, job.user)
+    job.total = sum(queryset.count() for queryset in querysets)
+    ClientJob.objects.filter(pk=job.pk).update(total=job.total)
+
+    deleted = 0
+    for queryset in querysets:
+        while pks := list(queryset.order_by("pk").values_list("pk", flat=True)[:chunk_size]):
+            with transaction.atomic():
+                queryset.model.objects.filter(pk__in=pks).delete()
+            deleted += len(pks)
+            job.report_progress(deleted)
+
+    exports = list(export_jobs(job.client, job.user))
+    with transaction.atomic():
+        ClientJob.objects.filter(pk__in=[export.pk for export in exports]).delete()
+        if job.client is not None:
+            job.client.delete()
+        if job.user is not None:
+            job.user.delete()
+        for export in exports:
+            if export.result:
+                # Kept should an enclosing transaction roll the rows back
+                transaction.on_commit(partial(export.result.delete, save=False))
+    job.client = job.user = None
+
+
+JOB_HANDLERS = {
+    ClientJob.Kind.EXPORT: run_export,
+    ClientJob.Kind.PURGE: run_purge,
+}
+
+
+def run_job(job):
+    """Runs a claimed job and records its outcome, failures are stored on the job instead of raised."""
+    try:
+        JOB_HANDLERS[job.kind](job)
+        job.status = ClientJob.Status.DONE
+    except Exception:
+        job.status = ClientJob.Status.FAILED
+        job.error = traceback.format_exc()
+    job.finished_at = timezone.now()
+    job.save()
+    return job
+
+
+def run_pending_jobs(limit=None):
+    """Runs queued jobs one after another, returns the jobs that were run."""
+    finished = []
+    while limit is None or len(finished) < limit:
+        job = ClientJob.claim_next()
+        if job is None:
+            break
+        finished.append(run_job(job))
+    return finished
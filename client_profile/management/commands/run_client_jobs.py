@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from client_profile.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Runs queued client jobs such as personal data exports."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, help="Stop after this many jobs")
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new jobs")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        while True:
+            for job in run_pending_jobs(limit=options["limit"]):
+                duration = (job.finished_at - job.started_at).total_seconds()
+                self.stdout.write(f"{job} in {duration:.2f}s")
+                if job.status == job.Status.FAILED:
+                    self.stderr.write(job.error)
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
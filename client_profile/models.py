@@ -1,3 +1,68 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+from cleaning_service.models import Client
+
+
+class ClientJob(models.Model):
+    """Background work requested by a client, picked up by the run_client_jobs command."""
+
+    class Kind(models.TextChoices):
+        EXPORT = 'EXPORT', 'Personal data export'
+        PURGE = 'PURGE', 'Account deletion'
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        RUNNING = 'RUNNING', 'Running'
+        DONE = 'DONE', 'Done'
+        FAILED = 'FAILED', 'Failed'
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    client = models.ForeignKey(Client, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                             related_name='client_jobs')
+    result = models.FileField(upload_to='client_jobs/', blank=True)
+    # Rows processed so far and in total, for jobs that report progress
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="client_job_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def percent_done(self):
+        if self.status == self.Status.DONE:
+            return 100
+        return int(self.progress * 100 / self.total) if self.total else 0
+
+    def report_progress(self, progress):
+        self.progress = progress
+        ClientJob.objects.filter(pk=self.pk).update(progress=progress)
+
+    @classmethod
+    def claim_next(cls):
+        """Marks the oldest pending job as running and returns it, None when the queue is empty.
+
+        The conditional UPDATE makes sure two workers never claim the same job.
+        """
+        while True:
+            job = cls.objects.filter(status=cls.Status.PENDING).order_by("created_at", "pk").first()
+            if job is None:
+                return None
+            now = timezone.now()
+            if cls.objects.filter(pk=job.pk, status=cls.Status.PENDING).update(status=cls.Status.RUNNING,
+                                                                                 started_at=now):
+                job.status = cls.Status.RUNNING
+                job.started_at = now
+                return job
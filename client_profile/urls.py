@@ -1,8 +1,12 @@
 from django.urls import path
-from .views import ClientView, UpdateClientView, DeleteClientView
+from .views import (ClientView, UpdateClientView, DeleteClientView,
+                    ClientDataExportView, RequestClientExportView, ClientJobDownloadView)
 
 urlpatterns = [
     path("clients/", ClientView.as_view(), name="client_profile"),
     path("clients/<int:pk>/edit/", UpdateClientView.as_view(), name="update_client"),
     path("clients/<int:pk>/delete/", DeleteClientView.as_view(), name="delete_client"),
+    path("clients/export/", ClientDataExportView.as_view(), name="client_data_export"),
+    path("clients/export/request/", RequestClientExportView.as_view(), name="request_client_export"),
+    path("clients/jobs/<int:pk>/download/", ClientJobDownloadView.as_view(), name="client_job_download"),
 ]
@@ -1,9 +1,13 @@
-from django.views.generic import DetailView, UpdateView, DeleteView
+from django.views.generic import View, DetailView, UpdateView, DeleteView
 from django.contrib.auth import logout, get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
 from cleaning_service.models import Client
+from .archive import archive_filename, stream_client_archive
 from .forms import ClientForm
+from .models import ClientJob
 
 
 User = get_user_model()
@@ -17,6 +21,11 @@ class ClientView(LoginRequiredMixin, DetailView):
     def get_object(self):
         return self.request.user.client_profile
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["export_jobs"] = self.object.jobs.filter(kind=ClientJob.Kind.EXPORT).order_by("-created_at")[:5]
+        return context
+
 
 class UpdateClientView(LoginRequiredMixin, UpdateView):
     form_class = ClientForm
@@ -33,6 +42,7 @@ class UpdateClientView(LoginRequiredMixin, UpdateView):
 
 
 class DeleteClientView(LoginRequiredMixin, DeleteView):
+    """Deactivates the account at once and leaves deleting its rows to the job worker."""
     model = User
     template_name = "service/confirm_client_deletion.html"
     success_url = reverse_lazy('home')
@@ -40,7 +50,41 @@ class DeleteClientView(LoginRequiredMixin, DeleteView):
     def get_object(self):
         return self.request.user
 
-    def delete(self, request, *args, **kwargs):
-        response = super().delete(request, *args, **kwargs)
-        logout(request)
+    def form_valid(self, form):
+        user = self.object
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+        ClientJob.objects.create(kind=ClientJob.Kind.PURGE, user=user,
+                                 client=Client.objects.filter(user=user).first())
+        logout(self.request)
+        return redirect(self.get_success_url())
+
+
+class ClientDataExportView(LoginRequiredMixin, View):
+    """Streams a ZIP archive with everything stored about the signed in client."""
+
+    def get(self, request):
+        client = request.user.client_profile
+        response = StreamingHttpResponse(stream_client_archive(client), content_type="application/zip")
+        response["Content-Disposition"] = f'attachment; filename="{archive_filename(client)}"'
         return response
+
+
+class RequestClientExportView(LoginRequiredMixin, View):
+    """Queues the archive to be built by the job worker, for clients with a long history."""
+
+    def post(self, request):
+        client = request.user.client_profile
+        queued = client.jobs.filter(kind=ClientJob.Kind.EXPORT,
+                                    status__in=[ClientJob.Status.PENDING, ClientJob.Status.RUNNING])
+        if not queued.exists():
+            ClientJob.objects.create(kind=ClientJob.Kind.EXPORT, client=client)
+        return redirect("client_profile")
+
+
+class ClientJobDownloadView(LoginRequiredMixin, View):
+    def get(self, request, pk):
+        job = get_object_or_404(ClientJob, pk=pk, client__user=request.user, status=ClientJob.Status.DONE)
+        if not job.result:
+            raise Http404("The archive is no longer available")
+        return FileResponse(job.result.open("rb"), as_attachment=True, filename=archive_filename(job.client))
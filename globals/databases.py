@@ -0,0 +1,11 @@
+from django.db import router
+
+
+def primary(queryset):
+    """The queryset reading from the database its model is written to.
+
+    Cached values are built with it: read from a lagging replica right after an
+    invalidation, the old rows would be cached again until the next change. Fills
+    after a plain expiry go to the primary too, one query per key and timeout.
+    """
+    return queryset.using(router.db_for_write(queryset.model))
@@ -0,0 +1,43 @@
+import hashlib
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def cached_feed(feed, version_func, timeout=FEED_CACHE_TIMEOUT):
+    """Wraps a syndication Feed so its body is generated once per content version.
+
+    `version_func` must return a value that changes whenever the feed items change
+    and must not query the database: a poll that finds nothing new is answered from
+    the cache, with 304 when the client sends a matching If-None-Match/If-Modified-Since.
+    """
+    name = f"{feed.__class__.__module__}.{feed.__class__.__name__}"
+
+    def view(request):
+        key = f"feed:{name}:{request.is_secure()}:{version_func()}"
+        cached = cache.get(key)
+        if cached is None:
+            response = feed(request)
+            cached = {
+                "content": response.content,
+                "content_type": response["Content-Type"],
+                "etag": quote_etag(hashlib.md5(response.content).hexdigest()),
+                "last_modified": parse_http_date_safe(response.get("Last-Modified", "")),
+            }
+            cache.set(key, cached, timeout)
+
+        not_modified = get_conditional_response(request, etag=cached["etag"], last_modified=cached["last_modified"])
+        if not_modified is not None:
+            return not_modified
+
+        response = HttpResponse(cached["content"], content_type=cached["content_type"])
+        response["ETag"] = cached["etag"]
+        if cached["last_modified"]:
+            response["Last-Modified"] = http_date(cached["last_modified"])
+        return response
+
+    return view
@@ -0,0 +1,27 @@
+import time
+
+from django.core.cache import cache
+
+
+def get_generation(key):
+    """The current value of a version counter, kept in the default cache without expiry."""
+    # A fresh counter starts from the current time so it never reuses the number of an evicted one
+    return cache.get_or_set(key, time.time_ns, None)
+
+
+def get_generations(keys):
+    """Maps each key to its counter with one cache round trip when all of them exist."""
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return found
+
+
+def bump_generation(key):
+    """Moves a counter on, so everything cached under its previous value is no longer read."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
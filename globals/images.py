@@ -0,0 +1,95 @@
+import json
+import os
+from functools import lru_cache
+
+from PIL import Image, ImageOps, features
+
+VARIANTS_PREFIX = "variants"
+VARIANTS_INDEX = "variants.json"
+RASTER_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+FORMAT_OPTIONS = {
+    "avif": {"quality": 60},
+    "webp": {"quality": 80},
+}
+# <source> elements are emitted in this order, browsers take the first type they support
+FORMAT_PREFERENCE = ("avif", "webp")
+
+
+def available_formats(formats):
+    """The formats Pillow was built with support for."""
+    return [fmt for fmt in formats if features.check(fmt)]
+
+
+def variant_name(name, width, fmt):
+    stem, _ = os.path.splitext(name)
+    return f"{VARIANTS_PREFIX}/{stem}-{width}w.{fmt}"
+
+
+def variant_widths(width, widths):
+    """The requested widths that do not upscale, plus the image's own width if it is smaller."""
+    return sorted({min(requested, width) for requested in widths})
+
+
+def plan_variants(sources, widths, formats):
+    """Builds the variants index and the list of variants to render.
+
+    `sources` maps static names to file paths. Returns (index, jobs): the index maps
+    every static name to its size and, per format, [width, variant name] pairs; a job
+    is (source path, variant name, width, format).
+    """
+    index = {}
+    jobs = []
+    for name, path in sorted(sources.items()):
+        with Image.open(path) as image:
+            size = image.size
+        entry = {"width": size[0], "height": size[1], "sources": {}}
+        for fmt in formats:
+            entry["sources"][fmt] = []
+            for width in variant_widths(size[0], widths):
+                entry["sources"][fmt].append([width, variant_name(name, width, fmt)])
+                jobs.append((path, variant_name(name, width, fmt), width, fmt))
+        index[name] = entry
+    return index, jobs
+
+
+def render_variant(source, target, width, fmt, force=False):
+    """Writes one resized variant, returns (target, bytes, whether it was rendered).
+
+    Variants newer than their source are kept, so repeated builds only redo what changed.
+    """
+    if not force and os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source):
+        return target, os.path.getsize(target), False
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+        if image.width > width:
+            image = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        partial = f"{target}.part"
+        image.save(partial, fmt.upper(), **FORMAT_OPTIONS[fmt])
+    os.replace(partial, target)
+    return target, os.path.getsize(target), True
+
+
+def write_index(build_dir, index):
+    path = os.path.join(build_dir, VARIANTS_PREFIX, VARIANTS_INDEX)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as index_file:
+        json.dump(index, index_file, indent=1, sort_keys=True)
+
+
+@lru_cache(maxsize=4)
+def _read_index(path, mtime):
+    with open(path) as index_file:
+        return json.load(index_file)
+
+
+def load_index(build_dir):
+    """The variants index written by the last build, {} before the first one."""
+    path = os.path.join(build_dir, VARIANTS_PREFIX, VARIANTS_INDEX)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    return _read_index(path, mtime)
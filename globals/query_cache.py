@@ -0,0 +1,165 @@
+import hashlib
+import threading
+from functools import lru_cache, partial
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Manager, QuerySet
+
+from . import generations
+from .databases import primary
+
+GENERATION_KEY = "query_cache:generation:{}"
+RESULT_KEY = "query_cache:rows:{}"
+STATS_KEY = "query_cache:stats:{}"
+STATS = ("hits", "misses", "invalidations")
+
+# Labels of models changed by the open transaction of each connection alias, per thread
+_dirty = threading.local()
+
+
+def _count(name):
+    key = STATS_KEY.format(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_stats():
+    counts = cache.get_many([STATS_KEY.format(name) for name in STATS])
+    stats = {name: counts.get(STATS_KEY.format(name), 0) for name in STATS}
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0
+    return stats
+
+
+def reset_stats():
+    cache.delete_many([STATS_KEY.format(name) for name in STATS])
+
+
+def _bump(label):
+    generations.bump_generation(GENERATION_KEY.format(label))
+    _count("invalidations")
+
+
+def bump_generation(model, using=DEFAULT_DB_ALIAS):
+    """Makes every cached queryset touching the model stale.
+
+    Inside a transaction the generation is bumped again on commit, so rows another
+    worker cached before the commit, still without the change, are not served.
+    """
+    label = model._meta.label_lower
+    _bump(label)
+    if transaction.get_connection(using).in_atomic_block:
+        dirty_labels(using).add(label)
+        transaction.on_commit(partial(_bump, label), using=using)
+
+
+def dirty_labels(using):
+    """Models changed in the open transaction, emptied once the connection leaves it."""
+    if not hasattr(_dirty, using):
+        setattr(_dirty, using, set())
+    labels = getattr(_dirty, using)
+    if labels and not transaction.get_connection(using).in_atomic_block:
+        labels.clear()
+    return labels
+
+
+def get_generations(labels):
+    keys = {label: GENERATION_KEY.format(label) for label in labels}
+    found = generations.get_generations(list(keys.values()))
+    return {label: found[key] for label, key in keys.items()}
+
+
+@lru_cache(maxsize=None)
+def _models_by_table():
+    return {model._meta.db_table: model for model in apps.get_models()}
+
+
+def compile_query(queryset):
+    """(sql, params, labels of the model and of every model joined into the query).
+
+    A copy of the query is compiled because joins for select_related() are only
+    added during compilation.
+    """
+    query = queryset.query.chain()
+    sql, params = query.get_compiler(queryset.db).as_sql()
+    tables = _models_by_table()
+    labels = {queryset.model._meta.label_lower}
+    for join in query.alias_map.values():
+        if join.table_name in tables:
+            labels.add(tables[join.table_name]._meta.label_lower)
+    return sql, params, sorted(labels)
+
+
+def cache_key(db, sql, params, labels):
+    counters = get_generations(labels)
+    source = repr((db, sql, params, [counters[label] for label in labels]))
+    return RESULT_KEY.format(hashlib.md5(source.encode()).hexdigest())
+
+
+class CachingQuerySet(QuerySet):
+    """QuerySet whose .cached() results are shared by all workers through the default cache.
+
+    Results are keyed by the SQL and the generation counters of every model in the query,
+    which post_save/post_delete receivers and the bulk methods below bump.
+    """
+
+    def cached(self, timeout=None):
+        """The rows as a list, from the cache when no queried model changed since.
+
+        A transaction that changed one of the queried models reads from the database
+        and caches nothing, its rows may still be rolled back.
+        Unless the queryset names a database, rows are read from the primary.
+        """
+        queryset = self if self._db else primary(self)
+        db = queryset.db
+        try:
+            sql, params, labels = compile_query(queryset)
+        except EmptyResultSet:
+            return []
+        if dirty_labels(db).intersection(labels):
+            return list(queryset)
+        key = cache_key(db, sql, params, labels)
+        rows = cache.get(key)
+        if rows is not None:
+            _count("hits")
+            return rows
+        _count("misses")
+        rows = list(queryset)
+        cache.set(key, rows, settings.QUERY_CACHE_TIMEOUT if timeout is None else timeout)
+        return rows
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        bump_generation(self.model, self.db)
+        return rows
+
+    update.alters_data = True
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        bump_generation(self.model, self.db)
+        return rows
+
+    bulk_update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        bump_generation(self.model, self.db)
+        return objs
+
+    bulk_create.alters_data = True
+
+
+CachingManager = Manager.from_queryset(CachingQuerySet)
+
+
+def invalidate_on_change(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """post_save/post_delete receiver for models with a CachingManager."""
+    bump_generation(sender, using)
@@ -0,0 +1,93 @@
+import logging
+import math
+import random
+import time
+import uuid
+from functools import wraps
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds a rebuild may hold the lock before another request may take over
+LOCK_TIMEOUT = 30
+# Seconds an expired value is kept to be served while it is rebuilt, or when rebuilding fails
+STALE_TIMEOUT = 60 * 10
+# Seconds a request waits for another request's rebuild when there is nothing to serve yet
+WAIT_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+
+
+def _should_refresh(entry, now, beta):
+    # XFetch: refresh early with a probability that rises as expiry nears and with the build time
+    return now - entry["delta"] * beta * math.log(1 - random.random()) >= entry["expires"]
+
+
+def _rebuild(key, build, timeout):
+    started = time.monotonic()
+    value = build()
+    delta = time.monotonic() - started
+    cache.set(key, {"value": value, "expires": time.time() + timeout, "delta": delta}, timeout + STALE_TIMEOUT)
+    return value
+
+
+def get_or_build(key, build, timeout, beta=1.0):
+    """The cached value of `key`, calling `build()` to (re)create it at most once at a time.
+
+    Values are refreshed a little before `timeout` runs out (probabilistic early
+    expiration), by the one request that gets the rebuild lock. Meanwhile other
+    requests get the previous value, or wait for the rebuild if there is none. If
+    a rebuild fails, the previous value is served while it is younger than STALE_TIMEOUT.
+    """
+    entry = cache.get(key)
+    if entry is not None and not _should_refresh(entry, time.time(), beta):
+        return entry["value"]
+
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while not cache.add(lock_key, token, LOCK_TIMEOUT):
+        if entry is not None:
+            return entry["value"]
+        if time.monotonic() >= deadline:
+            # The rebuilding request is stuck, do not keep this one waiting forever
+            return build()
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["value"]
+
+    try:
+        # Another request may have finished a rebuild between our read and taking the lock
+        fresh = cache.get(key)
+        if fresh is not None and (entry is None or fresh["expires"] != entry["expires"]):
+            return fresh["value"]
+        return _rebuild(key, build, timeout)
+    except Exception:
+        if entry is None:
+            raise
+        logger.exception("Rebuilding %s failed, serving the previous value", key)
+        return entry["value"]
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+def single_flight(key, timeout, beta=1.0):
+    """Decorator caching a function's result with get_or_build().
+
+    `key` is a string, or a callable returning the key for the call's arguments.
+    The wrapped function gets an `invalidate(*args, **kwargs)` attribute.
+    """
+    def make_key(args, kwargs):
+        return key(*args, **kwargs) if callable(key) else key
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return get_or_build(make_key(args, kwargs), lambda: func(*args, **kwargs), timeout, beta)
+
+        wrapper.invalidate = lambda *args, **kwargs: cache.delete(make_key(args, kwargs))
+        return wrapper
+
+    return decorator
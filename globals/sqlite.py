@@ -0,0 +1,27 @@
+import re
+
+from django.conf import settings
+
+PRAGMA_NAME = re.compile(r"^[a-z_]+$")
+PRAGMA_KEYWORD = re.compile(r"^[A-Za-z]+$")
+
+
+def pragma_statements(pragmas):
+    """PRAGMA statements for a mapping of names to integers or keywords such as WAL."""
+    statements = []
+    for name, value in pragmas.items():
+        if not PRAGMA_NAME.match(name):
+            raise ValueError(f"Invalid SQLite pragma name: {name!r}")
+        if isinstance(value, bool) or not (isinstance(value, int) or PRAGMA_KEYWORD.match(str(value))):
+            raise ValueError(f"Invalid value for SQLite pragma {name}: {value!r}")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+def apply_pragmas(connection):
+    """Applies settings.SQLITE_PRAGMAS to a new connection, other database vendors are left alone."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(getattr(settings, "SQLITE_PRAGMAS", {})):
+            cursor.execute(statement)
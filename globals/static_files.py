@@ -0,0 +1,95 @@
+import mimetypes
+import os
+import re
+
+from .storage import ENCODINGS
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class StaticFile:
+    """A collected file with its headers, compressed siblings and, when small, its bytes."""
+
+    def __init__(self, path, immutable, max_age, memory_max_size):
+        stat = os.stat(path)
+        self.path = path
+        self.size = stat.st_size
+        self.content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if self.content_type.startswith("text/") or self.content_type in ("application/javascript", "image/svg+xml"):
+            self.content_type += "; charset=utf-8"
+        self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        self.last_modified = stat.st_mtime
+        self.cache_control = (
+            "public, max-age=31536000, immutable" if immutable else f"public, max-age={max_age}"
+        )
+        # Content-Encoding -> (path, size) of every precompressed sibling
+        self.encodings = {}
+        for suffix, encoding in ENCODINGS:
+            sibling = f"{path}.{suffix}"
+            if os.path.exists(sibling):
+                self.encodings[encoding] = (sibling, os.path.getsize(sibling))
+
+        self.contents = {}
+        if self.size <= memory_max_size:
+            self.contents[None] = self._read(path)
+            for encoding, (sibling, _) in self.encodings.items():
+                self.contents[encoding] = self._read(sibling)
+
+    @staticmethod
+    def _read(path):
+        with open(path, "rb") as file:
+            return file.read()
+
+    def negotiate(self, accept_encoding):
+        """The best precompressed encoding the client accepts, None for the plain file."""
+        accepted = set()
+        for part in accept_encoding.split(","):
+            coding, *params = part.split(";")
+            quality = 1.0
+            for param in params:
+                key, _, value = param.strip().partition("=")
+                if key == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0
+            if quality > 0:
+                accepted.add(coding.strip().lower())
+        for _, encoding in ENCODINGS:
+            if encoding in self.encodings and (encoding in accepted or "*" in accepted):
+                return encoding
+        return None
+
+    def byte_range(self, header):
+        """(start, end) of a single satisfiable `Range: bytes=` header, None to send everything.
+
+        Raises ValueError for a range outside of the file.
+        """
+        match = RANGE_PATTERN.match(header.strip())
+        if not match or match.groups() == ("", ""):
+            return None
+        first, last = match.groups()
+        if first:
+            start, end = int(first), min(int(last) if last else self.size - 1, self.size - 1)
+        else:
+            start, end = max(self.size - int(last), 0), self.size - 1
+        if start > end:
+            raise ValueError(header)
+        return start, end
+
+
+def collect_static_files(root, hashed_names, max_age, memory_max_size):
+    """Maps the name of every file under STATIC_ROOT to its StaticFile.
+
+    Compressed siblings are attached to their file instead of being served on their own.
+    """
+    suffixes = tuple(f".{suffix}" for suffix, _ in ENCODINGS)
+    files = {}
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            if filename.endswith(suffixes) and os.path.exists(os.path.splitext(path)[0]):
+                continue
+            name = os.path.relpath(path, root).replace(os.sep, "/")
+            files[name] = StaticFile(path, name in hashed_names, max_age, memory_max_size)
+    return files
@@ -0,0 +1,75 @@
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage
+
+try:
+    import brotli
+except ImportError:  # Optional, without it only gzip siblings are written
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".json", ".map", ".txt", ".html", ".xml", ".ico", ".ttf", ".otf"}
+# A compressed sibling is only kept when it saves at least this share of the bytes
+MIN_COMPRESSION_SAVING = 0.05
+# Sibling suffix and the Content-Encoding it is served with, in order of preference
+ENCODINGS = (("br", "br"), ("gz", "gzip"))
+
+
+def _encoders():
+    encoders = {"gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoders["br"] = lambda data: brotli.compress(data, quality=11)
+    return encoders
+
+
+def compress_file(path):
+    """Writes .gz (and with brotli installed .br) siblings of a static file, returns their paths.
+
+    Siblings newer than the file are left alone, and siblings that would not save
+    MIN_COMPRESSION_SAVING of the bytes are removed.
+    """
+    written = []
+    data = None
+    for suffix, encode in _encoders().items():
+        target = f"{path}.{suffix}"
+        if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+            written.append(target)
+            continue
+        if data is None:
+            with open(path, "rb") as source:
+                data = source.read()
+        compressed = encode(data)
+        if len(compressed) > len(data) * (1 - MIN_COMPRESSION_SAVING):
+            if os.path.exists(target):
+                os.remove(target)
+            continue
+        with open(target, "wb") as sibling:
+            sibling.write(compressed)
+        written.append(target)
+    return written
+
+
+class ManifestStaticStorage(ManifestStaticFilesStorage):
+    """Hashed static file names from the collectstatic manifest.
+
+    Names missing from the manifest, because collectstatic has not run (development,
+    tests) or the file does not exist, are served under their plain name instead of
+    raising, like with the default storage. Collecting writes precompressed siblings
+    of text files for StaticFilesMiddleware.
+    """
+    manifest_strict = False
+
+    def url(self, name, force=False):
+        try:
+            return super().url(name, force)
+        except ValueError:
+            return FileSystemStorage.url(self, name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in {*paths, *self.hashed_files.values()}:
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS and self.exists(name):
+                compress_file(self.path(name))
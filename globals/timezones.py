@@ -0,0 +1,89 @@
+from bisect import bisect_left
+from functools import lru_cache
+
+import pytz
+from django import forms
+from django.urls import reverse_lazy
+from django.utils.html import format_html
+
+TIMEZONE_LOOKUP_LIMIT = 20
+
+# Every name pytz accepts is valid, so profiles saved before validation keep working
+VALID_TIMEZONES = frozenset(pytz.all_timezones)
+COMMON_TIMEZONES = tuple(pytz.common_timezones)
+
+
+def _build_index():
+    """Sorted (key, timezone) pairs, one for the full name and one per path segment.
+
+    Keys are lower case with spaces for underscores, so "new y" finds America/New_York
+    and "zur" finds Europe/Zurich.
+    """
+    entries = set()
+    for name in COMMON_TIMEZONES:
+        key = name.lower().replace("_", " ")
+        entries.add((key, name))
+        for segment in key.split("/")[1:]:
+            entries.add((segment, name))
+    return sorted(entries)
+
+
+_INDEX = _build_index()
+_KEYS = [key for key, _ in _INDEX]
+
+
+@lru_cache(maxsize=1024)
+def search_timezones(prefix, limit=TIMEZONE_LOOKUP_LIMIT):
+    """Returns up to `limit` common timezone names with a segment starting with `prefix`."""
+    prefix = prefix.strip().lower().replace("_", " ")
+    if not prefix:
+        return COMMON_TIMEZONES[:limit]
+
+    results = []
+    for position in range(bisect_left(_KEYS, prefix), len(_KEYS)):
+        key, name = _INDEX[position]
+        if not key.startswith(prefix):
+            break
+        if name not in results:
+            results.append(name)
+            if len(results) == limit:
+                break
+    return tuple(sorted(results))
+
+
+class TimezoneInput(forms.TextInput):
+    """Text input completed from the timezone lookup endpoint instead of a 430 option select."""
+
+    class Media:
+        js = ["js/timezone_picker.js"]
+
+    def __init__(self, attrs=None):
+        super().__init__({"autocomplete": "off", "placeholder": "Europe/Zurich", **(attrs or {})})
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        widget_attrs = context["widget"]["attrs"]
+        widget_attrs["list"] = f"{widget_attrs.get('id', name)}_options"
+        widget_attrs["data-timezone-lookup"] = reverse_lazy("timezones")
+        return context
+
+    def render(self, name, value, attrs=None, renderer=None):
+        html = super().render(name, value, attrs, renderer)
+        list_id = f"{(attrs or {}).get('id', name)}_options"
+        return format_html('{}<datalist id="{}"></datalist>', html, list_id)
+
+
+class TimezoneField(forms.CharField):
+    widget = TimezoneInput
+    default_error_messages = {
+        "invalid_timezone": "Unknown timezone, pick one from the list (e.g. Europe/Zurich).",
+    }
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("max_length", 30)
+        super().__init__(**kwargs)
+
+    def validate(self, value):
+        super().validate(value)
+        if value and value not in VALID_TIMEZONES:
+            raise forms.ValidationError(self.error_messages["invalid_timezone"], code="invalid_timezone")
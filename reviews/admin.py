@@ -1,7 +1,27 @@
 from django.contrib import admin
+from django.utils import timezone
 from .models import Review
 
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
-    pass
+    list_display = ('title', 'author', 'score', 'status', 'moderation_score', 'publication_date')
+    list_filter = ('status',)
+    readonly_fields = ('moderation_score', 'moderated_at')
+    actions = ['approve', 'reject']
+
+    def _set_status(self, request, queryset, status):
+        # Saved one by one so the signals keep the rating summary in sync
+        for review in queryset:
+            review.status = status
+            review.moderated_at = timezone.now()
+            review.save(update_fields=['status', 'moderated_at'])
+        self.message_user(request, f"Marked {len(queryset)} reviews as {status.label.lower()}.")
+
+    def approve(self, request, queryset):
+        self._set_status(request, queryset, Review.Status.APPROVED)
+    approve.short_description = "Approve selected reviews"
+
+    def reject(self, request, queryset):
+        self._set_status(request, queryset, Review.Status.REJECTED)
+    reject.short_description = "Reject selected reviews"
@@ -0,0 +1,11 @@
+from globals.generations import bump_generation, get_generation
+
+REVIEW_VERSION_KEY = "reviews:review_version"
+
+
+def get_review_version():
+    return get_generation(REVIEW_VERSION_KEY)
+
+
+def bump_review_version():
+    bump_generation(REVIEW_VERSION_KEY)
@@ -0,0 +1,39 @@
+from django.contrib.syndication.views import Feed
+from django.urls import reverse, reverse_lazy
+from django.utils.feedgenerator import Atom1Feed
+
+from globals.databases import primary
+from .models import Review
+
+FEED_SIZE = 20
+
+
+class LatestReviewsFeed(Feed):
+    title = "Cleaning Service reviews"
+    link = reverse_lazy("reviews")
+    description = "Latest customer reviews of Cleaning Service"
+
+    def items(self):
+        return primary(Review.objects).filter(status=Review.Status.APPROVED).select_related("author").order_by(
+            "-publication_date", "-id"
+        )[:FEED_SIZE]
+
+    def item_title(self, item):
+        return f"{item.title} ({item.score}/10)"
+
+    def item_description(self, item):
+        return item.content
+
+    def item_link(self, item):
+        return f"{reverse('reviews')}#review-{item.pk}"
+
+    def item_pubdate(self, item):
+        return item.publication_date
+
+    def item_author_name(self, item):
+        return str(item.author)
+
+
+class LatestReviewsAtomFeed(LatestReviewsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestReviewsFeed.description
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.moderation import MODERATION_BATCH_SIZE, run_moderation
+
+
+class Command(BaseCommand):
+    help = "Scores pending reviews in batches with a worker pool and approves or rejects them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--batch-size", type=int, default=MODERATION_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new reviews")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        while True:
+            approved, rejected, elapsed = run_moderation(workers=options["workers"], batch_size=options["batch_size"])
+            total = approved + rejected
+            if total or not options["loop"]:
+                rate = total / elapsed if elapsed else 0
+                self.stdout.write(f"Moderated {total} reviews ({approved} approved, {rejected} rejected) "
+                                  f"in {elapsed:.2f}s, {rate:.0f} reviews/s")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
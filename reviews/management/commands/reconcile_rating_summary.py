@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import RatingSummary
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the review rating summary from the reviews table and reports any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report drift, do not fix it")
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        stored = RatingSummary.get()
+        expected = RatingSummary.compute()
+
+        fields = ["count", "total"] + [f"score_{score}" for score in RatingSummary.SCORES]
+        drift = [(field, getattr(stored, field), getattr(expected, field))
+                 for field in fields if getattr(stored, field) != getattr(expected, field)]
+
+        if not drift:
+            self.stdout.write("Rating summary is in sync")
+            return
+
+        for field, stored_value, expected_value in drift:
+            self.stdout.write(f"{field}: stored {stored_value}, actual {expected_value}")
+
+        if not options["dry_run"]:
+            expected.save()
+            self.stdout.write(f"Rating summary rebuilt, {len(drift)} fields corrected")
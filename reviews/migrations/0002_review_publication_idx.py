@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['-publication_date', '-id'], name='review_publication_idx'),
+        ),
+    ]
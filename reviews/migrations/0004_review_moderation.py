@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_ratingsummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_publication_idx',
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='moderated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='moderation_score',
+            field=models.FloatField(blank=True, help_text='Spam/abuse probability from the scorer', null=True),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='status',
+            # Reviews published before moderation existed stay visible
+            field=models.CharField(choices=[('PENDING', 'Pending moderation'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], default='APPROVED', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending moderation'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], default='PENDING', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['status', '-publication_date', '-id'], name='review_status_publication_idx'),
+        ),
+    ]
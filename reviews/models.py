@@ -1,10 +1,17 @@
 from django.db import models
+from django.db.models import Count, F, Sum
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 
 class Review(models.Model):
     "Represents a review"
+
+    class Status(models.TextChoices):
+        PENDING = 'PENDING', 'Pending moderation'
+        APPROVED = 'APPROVED', 'Approved'
+        REJECTED = 'REJECTED', 'Rejected'
+
     title = models.CharField(max_length=256)
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     content = models.TextField()
@@ -16,6 +23,109 @@ class Review(models.Model):
         ],
         default=1
     )
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    moderation_score = models.FloatField(null=True, blank=True, help_text="Spam/abuse probability from the scorer")
+    moderated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "-publication_date", "-id"], name="review_status_publication_idx"),
+        ]
+
+    @property
+    def rating(self):
+        """The score this review contributes to the rating summary, None unless approved."""
+        return self.score if self.status == self.Status.APPROVED else None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored rating so the rating summary can move it between buckets on update
+        if "score" in field_names and "status" in field_names:
+            instance._loaded_rating = instance.rating
+        return instance
 
     def __str__(self):
         return f"Review: {self.title}"
+
+
+class RatingSummary(models.Model):
+    "Running count, sum and per-score histogram of approved review scores, a single row kept in sync by signals"
+    SCORES = range(1, 11)
+
+    count = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    score_1 = models.PositiveIntegerField(default=0)
+    score_2 = models.PositiveIntegerField(default=0)
+    score_3 = models.PositiveIntegerField(default=0)
+    score_4 = models.PositiveIntegerField(default=0)
+    score_5 = models.PositiveIntegerField(default=0)
+    score_6 = models.PositiveIntegerField(default=0)
+    score_7 = models.PositiveIntegerField(default=0)
+    score_8 = models.PositiveIntegerField(default=0)
+    score_9 = models.PositiveIntegerField(default=0)
+    score_10 = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def get(cls):
+        """The summary row, created by migration 0003 and rebuilt should it be missing.
+
+        A plain read, so pages showing the summary stay on the replicas.
+        """
+        try:
+            return cls.objects.get(pk=1)
+        except cls.DoesNotExist:
+            return cls.rebuild()
+
+    @classmethod
+    def compute(cls):
+        """Builds an unsaved summary from the reviews table."""
+        summary = cls(pk=1)
+        approved = Review.objects.filter(status=Review.Status.APPROVED)
+        for row in approved.values("score").annotate(reviews=Count("id"), score_total=Sum("score")):
+            summary.count += row["reviews"]
+            summary.total += row["score_total"]
+            if row["score"] in cls.SCORES:
+                setattr(summary, f"score_{row['score']}", row["reviews"])
+        return summary
+
+    @classmethod
+    def rebuild(cls):
+        summary = cls.compute()
+        summary.save()
+        return summary
+
+    @classmethod
+    def record(cls, added=(), removed=()):
+        """Atomically adds and removes review scores with a single UPDATE, None scores are ignored."""
+        deltas = {}
+        scores = [(score, 1) for score in added] + [(score, -1) for score in removed]
+        for score, sign in scores:
+            if score is None:
+                continue
+            deltas["count"] = deltas.get("count", 0) + sign
+            deltas["total"] = deltas.get("total", 0) + sign * score
+            if score in cls.SCORES:
+                deltas[f"score_{score}"] = deltas.get(f"score_{score}", 0) + sign
+
+        updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if updates and not cls.objects.filter(pk=1).update(**updates):
+            cls.rebuild()
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def histogram(self):
+        return [(score, getattr(self, f"score_{score}")) for score in self.SCORES]
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "average": round(self.average, 2) if self.count else None,
+            "histogram": {str(score): reviews for score, reviews in self.histogram},
+        }
+
+    def __str__(self):
+        return f"Rating summary: {self.count} reviews"
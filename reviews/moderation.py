@@ -0,0 +1,116 @@
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Review, RatingSummary
+from .cache import bump_review_version
+
+MODERATION_BATCH_SIZE = 500
+
+
+class KeywordScorer:
+    """Cheap heuristic scorer: blocked words, links and shouting raise the spam probability.
+
+    Any class with a `score_batch(reviews)` method returning one probability in [0, 1]
+    per review can be plugged in through the REVIEW_MODERATION_SCORER setting.
+    """
+    blocked_words = {"casino", "viagra", "crypto", "loan", "xxx", "idiot", "scam"}
+    link_pattern = re.compile(r"https?://|www\.", re.IGNORECASE)
+    word_pattern = re.compile(r"\w+")
+
+    def score(self, review):
+        text = f"{review.title} {review.content}"
+        words = [word.lower() for word in self.word_pattern.findall(text)]
+        if not words:
+            return 1.0
+
+        probability = 0.0
+        probability += 0.5 * sum(word in self.blocked_words for word in words)
+        probability += 0.3 * len(self.link_pattern.findall(text))
+        letters = [char for char in text if char.isalpha()]
+        if len(letters) > 20 and sum(char.isupper() for char in letters) / len(letters) > 0.7:
+            probability += 0.3
+        return min(probability, 1.0)
+
+    def score_batch(self, reviews):
+        return [self.score(review) for review in reviews]
+
+
+def get_scorer():
+    return import_string(settings.REVIEW_MODERATION_SCORER)()
+
+
+def apply_decisions(decisions):
+    """Stores (review, probability) decisions and updates the rating summary in one transaction.
+
+    Reviews sharing a status and probability are written with a single UPDATE, scorers
+    return few distinct values so a batch needs only a handful of queries. Only reviews
+    that are still pending are touched, so a decision made by a moderator meanwhile wins.
+    """
+    decisions = list(decisions)
+    threshold = settings.REVIEW_MODERATION_THRESHOLD
+    now = timezone.now()
+
+    with transaction.atomic():
+        pending = set(Review.objects.filter(
+            pk__in=[review.pk for review, _ in decisions], status=Review.Status.PENDING
+        ).values_list("pk", flat=True))
+
+        groups = defaultdict(list)
+        approved = rejected = 0
+        added = []
+        for review, probability in decisions:
+            if review.pk not in pending:
+                continue
+            if probability >= threshold:
+                status = Review.Status.REJECTED
+                rejected += 1
+            else:
+                status = Review.Status.APPROVED
+                approved += 1
+                added.append(review.score)
+            groups[status, probability].append(review.pk)
+
+        for (status, probability), pks in groups.items():
+            Review.objects.filter(pk__in=pks).update(status=status, moderation_score=probability, moderated_at=now)
+        RatingSummary.record(added=added)
+
+    if approved:
+        bump_review_version()
+    return approved, rejected
+
+
+def run_moderation(scorer=None, workers=4, batch_size=MODERATION_BATCH_SIZE):
+    """Moderates every pending review once and returns (approved, rejected, seconds).
+
+    Batches are scored concurrently by a thread pool while the results are written from
+    the calling thread, which keeps SQLite to a single writer.
+    """
+    scorer = scorer or get_scorer()
+    started = time.perf_counter()
+    approved = rejected = 0
+    last_pk = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            reviews = list(
+                Review.objects.filter(status=Review.Status.PENDING, pk__gt=last_pk)
+                .only("title", "content", "score", "status").order_by("pk")[:batch_size * workers]
+            )
+            if not reviews:
+                break
+            last_pk = reviews[-1].pk
+
+            batches = [reviews[i:i + batch_size] for i in range(0, len(reviews), batch_size)]
+            for batch, probabilities in zip(batches, pool.map(scorer.score_batch, batches)):
+                batch_approved, batch_rejected = apply_decisions(zip(batch, probabilities))
+                approved += batch_approved
+                rejected += batch_rejected
+
+    return approved, rejected, time.perf_counter() - started
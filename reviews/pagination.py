@@ -0,0 +1,39 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+REVIEWS_PAGE_SIZE = 20
+
+
+def encode_cursor(review):
+    raw = f"{review.publication_date.isoformat()}|{review.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Returns (publication_date, id) for a cursor, raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        publication_date, pk = raw.split("|")
+        return datetime.fromisoformat(publication_date), int(pk)
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def get_review_page(queryset, cursor=None, page_size=REVIEWS_PAGE_SIZE):
+    """Returns one page of reviews, newest first, and the cursor of the next page (or None).
+
+    Pages are cut by keyset on (publication_date, id) so every page costs the same
+    single indexed query no matter how deep the reader scrolls.
+    """
+    queryset = queryset.select_related("author").order_by("-publication_date", "-id")
+    if cursor:
+        publication_date, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(publication_date__lt=publication_date) | Q(publication_date=publication_date, id__lt=pk)
+        )
+
+    reviews = list(queryset[:page_size + 1])
+    next_cursor = encode_cursor(reviews[page_size - 1]) if len(reviews) > page_size else None
+    return reviews[:page_size], next_cursor
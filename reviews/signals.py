@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Review, RatingSummary
+from .cache import bump_review_version
+
+
+@receiver(post_save, sender=Review)
+def handle_review_saved(sender, instance, created, **kwargs):
+    if created:
+        RatingSummary.record(added=[instance.rating])
+    elif not hasattr(instance, "_loaded_rating"):
+        # The previous rating is unknown (instance was not loaded from the database)
+        RatingSummary.rebuild()
+    elif instance._loaded_rating != instance.rating:
+        RatingSummary.record(added=[instance.rating], removed=[instance._loaded_rating])
+    instance._loaded_rating = instance.rating
+    bump_review_version()
+
+
+@receiver(post_delete, sender=Review)
+def handle_review_deleted(sender, instance, **kwargs):
+    RatingSummary.record(removed=[getattr(instance, "_loaded_rating", instance.rating)])
+    bump_review_version()
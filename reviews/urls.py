@@ -1,8 +1,15 @@
 from django.urls import path, re_path
+from globals.feeds import cached_feed
 from . import views
+from .feeds import LatestReviewsFeed, LatestReviewsAtomFeed
+from .cache import get_review_version
 
 urlpatterns = [
     path("reviews/", views.ReviewView.as_view(), name="reviews"),
+    path("reviews/more/", views.MoreReviewsView.as_view(), name="more_reviews"),
+    path("reviews/summary/", views.rating_summary, name="rating_summary"),
+    path("reviews/feed/rss/", cached_feed(LatestReviewsFeed(), get_review_version), name="reviews_rss"),
+    path("reviews/feed/atom/", cached_feed(LatestReviewsAtomFeed(), get_review_version), name="reviews_atom"),
     path("review/add/", views.AddReviewView.as_view(), name="add_review"),
     re_path(r"^review/edit/(?P<pk>\d+)/$", views.UpdateReviewView.as_view(), name="edit_review"),
     re_path(r"^review/delete/(?P<pk>\d+)/$", views.DeleteReviewView.as_view(), name="delete_review")
@@ -1,9 +1,20 @@
-from django.views.generic import TemplateView, CreateView, UpdateView, DeleteView
+from django.views.generic import View, TemplateView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse_lazy
+from django.core.exceptions import BadRequest
+from django.http import JsonResponse
+from django.template.loader import render_to_string
 from globals.utils import get_tz
-from .models import Review
+from .models import Review, RatingSummary
 from .forms import ReviewForm
+from .pagination import get_review_page
+
+
+def _get_page(request):
+    try:
+        return get_review_page(Review.objects.filter(status=Review.Status.APPROVED), request.GET.get("cursor"))
+    except ValueError:
+        raise BadRequest("Invalid cursor")
 
 
 class ReviewView(TemplateView):
@@ -11,12 +22,25 @@ class ReviewView(TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["reviews"] = Review.objects.order_by("publication_date")
         context["tz_info"] = get_tz(self.request.user)
-        context["reviews"] = Review.objects.order_by("publication_date").reverse()
+        context["reviews"], context["next_cursor"] = _get_page(self.request)
+        context["rating_summary"] = RatingSummary.get()
         return context
 
 
+def rating_summary(request):
+    return JsonResponse(RatingSummary.get().as_dict())
+
+
+class MoreReviewsView(View):
+    """Returns the next page of reviews as an HTML fragment for infinite scroll."""
+
+    def get(self, request):
+        reviews, next_cursor = _get_page(request)
+        html = render_to_string("service/review_items.html", {"reviews": reviews}, request=request)
+        return JsonResponse({"html": html, "next_cursor": next_cursor})
+
+
 class AddReviewView(LoginRequiredMixin, CreateView):
     login_url = reverse_lazy("login")
     template_name = "service/review_form.html"
@@ -37,6 +61,14 @@ class UpdateReviewView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     def test_func(self):
         return self.get_object().author == self.request.user
 
+    def form_valid(self, form):
+        # Edited text has not been moderated, the review waits for the moderator again
+        if {"title", "content"}.intersection(form.changed_data):
+            form.instance.status = Review.Status.PENDING
+            form.instance.moderation_score = None
+            form.instance.moderated_at = None
+        return super().form_valid(form)
+
 
 class DeleteReviewView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
     model = Review
@@ -0,0 +1,36 @@
+// Fills the <datalist> of timezone inputs from the lookup endpoint while the user types.
+document.addEventListener("DOMContentLoaded", function () {
+  document.querySelectorAll("input[data-timezone-lookup]").forEach(function (input) {
+    var list = document.getElementById(input.getAttribute("list"));
+    var cache = {};
+    var timer = null;
+
+    function fill(results) {
+      list.replaceChildren.apply(list, results.map(function (name) {
+        var option = document.createElement("option");
+        option.value = name;
+        return option;
+      }));
+    }
+
+    function lookup() {
+      var query = input.value.trim().toLowerCase();
+      if (cache[query]) {
+        fill(cache[query]);
+        return;
+      }
+      fetch(input.dataset.timezoneLookup + "?q=" + encodeURIComponent(query))
+        .then(function (response) { return response.json(); })
+        .then(function (data) {
+          cache[query] = data.results;
+          fill(data.results);
+        });
+    }
+
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      timer = setTimeout(lookup, 150);
+    });
+    input.addEventListener("focus", lookup, { once: true });
+  });
+});
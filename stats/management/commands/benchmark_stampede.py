@@ -0,0 +1,77 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from globals.single_flight import get_or_build
+
+BENCH_KEY = "benchmark:stampede"
+
+
+def naive_get(key, build, timeout):
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout)
+    return value
+
+
+class Command(BaseCommand):
+    help = ("Hammers one expiring cache key from many threads, with a plain get/set and with "
+            "single-flight rebuilds, and reports how often the value was rebuilt, how many rebuilds "
+            "ran at once and how many requests had to wait for one.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=20)
+        parser.add_argument("--duration", type=float, default=5.0, help="Seconds per strategy")
+        parser.add_argument("--timeout", type=float, default=1.0, help="Seconds the value stays cached")
+        parser.add_argument("--cost", type=float, default=0.2, help="Seconds a rebuild takes")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{options['threads']} threads, {options['duration']}s each, value cached "
+                          f"{options['timeout']}s, rebuild takes {options['cost']}s")
+        self.stdout.write(f"{'strategy':<26}{'requests':>10}{'rebuilds':>10}{'at once':>9}{'blocked':>9}")
+        strategies = (
+            ("plain get/set", naive_get),
+            ("single-flight", get_or_build),
+            ("single-flight, no early", lambda key, build, timeout: get_or_build(key, build, timeout, beta=0)),
+        )
+        for name, get in strategies:
+            counts = self.run(get, options)
+            self.stdout.write(f"{name:<26}{counts['requests']:>10}{counts['rebuilds']:>10}"
+                              f"{counts['peak']:>9}{counts['blocked']:>9}")
+
+    def run(self, get, options):
+        cache.delete_many([BENCH_KEY, f"{BENCH_KEY}:lock"])
+        lock = threading.Lock()
+        counts = {"requests": 0, "rebuilds": 0, "running": 0, "peak": 0, "blocked": 0}
+
+        def build():
+            with lock:
+                counts["rebuilds"] += 1
+                counts["running"] += 1
+                counts["peak"] = max(counts["peak"], counts["running"])
+            time.sleep(options["cost"])
+            with lock:
+                counts["running"] -= 1
+            return time.time()
+
+        def worker(deadline):
+            while time.monotonic() < deadline:
+                started = time.monotonic()
+                get(BENCH_KEY, build, options["timeout"])
+                waited = time.monotonic() - started
+                with lock:
+                    counts["requests"] += 1
+                    # Waited for a rebuild, its own or another request's
+                    counts["blocked"] += waited >= options["cost"] / 2
+                time.sleep(0.01)
+
+        deadline = time.monotonic() + options["duration"]
+        threads = [threading.Thread(target=worker, args=(deadline,)) for _ in range(options["threads"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counts
@@ -3,4 +3,5 @@ from . import views
 
 urlpatterns = [
     path("stats/", views.StatsView.as_view(), name="stats"),
+    path("stats/query-cache/", views.QueryCacheStatsView.as_view(), name="query_cache_stats"),
 ]
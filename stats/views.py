@@ -3,12 +3,48 @@ from django.db.models import Count
 import base64
 import io
 import matplotlib.pyplot as plt
-from django.views.generic import TemplateView
+from django.http import JsonResponse
+from django.views.generic import TemplateView, View
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from globals.query_cache import get_stats
+from globals.single_flight import get_or_build
 
 import matplotlib
 matplotlib.use('Agg')
 
+REVIEW_CHART_CACHE_KEY = 'stats:review_chart'
+REVIEW_CHART_TIMEOUT = 60 * 5
+
+
+def render_review_chart():
+    """Bar chart of the number of reviews per user as a base64 encoded PNG."""
+    users = User.objects.annotate(review_count=Count('review'))
+    usernames = [user.username for user in users]
+    counts = [user.review_count for user in users]
+    plt.figure(figsize=(10, 6))
+    bars = plt.bar(usernames, counts)
+    plt.xlabel('Users')
+    plt.ylabel('Number of Reviews')
+    plt.title('User Review Statistics')
+    plt.xticks(rotation=45, ha='right')  # Rotate labels for readability
+
+    for bar in bars:
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2., height,
+                 f'{int(height)}',
+                 ha='center', va='bottom')
+
+    plt.tight_layout()
+
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format='png')
+    buffer.seek(0)
+    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+    buffer.close()
+    plt.close()
+
+    return image_base64
+
 
 class StatsView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
     template_name = 'stats.html'
@@ -18,30 +54,15 @@ class StatsView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        users = User.objects.annotate(review_count=Count('review'))
-        usernames = [user.username for user in users]
-        counts = [user.review_count for user in users]
-        plt.figure(figsize=(10, 6))
-        bars = plt.bar(usernames, counts)
-        plt.xlabel('Users')
-        plt.ylabel('Number of Reviews')
-        plt.title('User Review Statistics')
-        plt.xticks(rotation=45, ha='right')  # Rotate labels for readability
-
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height,
-                     f'{int(height)}',
-                     ha='center', va='bottom')
-
-        plt.tight_layout()
-
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        buffer.close()
-        plt.close()
-
-        context['chart_image'] = image_base64
+        context['chart_image'] = get_or_build(REVIEW_CHART_CACHE_KEY, render_review_chart, REVIEW_CHART_TIMEOUT)
         return context
+
+
+class QueryCacheStatsView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Hit, miss and invalidation counts of the query cache, shared by all workers."""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(get_stats())
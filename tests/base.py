@@ -0,0 +1,23 @@
+from django import test
+
+from cleaning_service.activity import login_buffer
+
+
+class LoginBufferCleanupMixin:
+    """Drops the logins a test buffered.
+
+    The buffer lives in the process, not in the database, so logins left behind
+    would be flushed by a later test, inside its assertNumQueries().
+    """
+
+    def _post_teardown(self):
+        super()._post_teardown()
+        login_buffer.clear()
+
+
+class TestCase(LoginBufferCleanupMixin, test.TestCase):
+    pass
+
+
+class TransactionTestCase(LoginBufferCleanupMixin, test.TransactionTestCase):
+    pass
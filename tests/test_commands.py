@@ -0,0 +1,326 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import connection
+from django.core.management.base import CommandError
+from django.test import override_settings
+from PIL import Image
+import sqlite3
+from django.utils import timezone
+from cleaning_service.models import Client, Order, OrderItem, Service, ServiceType, Staff
+from cleaning_service.quotes import get_price_table
+from cleaning_service.catalog import get_service_type_overview
+from django.contrib.auth import get_user_model
+from reviews.models import Review, RatingSummary
+from blog.models import Article
+from blog.search import ArticleSearch
+from globals.sqlite import pragma_statements
+from cleaning_service.management.commands.sync_replicas import Command as SyncReplicasCommand
+from tests.base import TestCase, TransactionTestCase
+
+User = get_user_model()
+
+
+def write_csv(content):
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "w") as csv_file:
+        csv_file.write(content)
+    return path
+
+
+class ExportDataCommandTest(TestCase):
+    def setUp(self):
+        client = Client.objects.create(name="Test Client", contact_number="+375291234567")
+        service = Service.objects.create(
+            service_type=ServiceType.objects.create(name="Test"),
+            name="Test Service",
+            price=100
+        )
+        self.order = Order.objects.create(client=client, address="Test", work_date=timezone.now())
+        OrderItem.objects.create(order=self.order, service=service, quantity=2)
+
+    def test_orders_jsonl(self):
+        out = StringIO()
+        call_command("export_data", "orders", "--format", "jsonl", "--chunk-size", "1", stdout=out)
+        record = json.loads(out.getvalue().splitlines()[0])
+        self.assertEqual(record["order_code"], str(self.order.order_code))
+        self.assertEqual(record["items"][0]["quantity"], 2)
+
+    def test_clients_csv(self):
+        out = StringIO()
+        call_command("export_data", "clients", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("id,name,client_type"))
+        self.assertIn("Test Client", lines[1])
+
+
+class ImportDataCommandTest(TestCase):
+    def setUp(self):
+        ServiceType.objects.create(name="Residential")
+
+    def import_csv(self, dataset, content, *args):
+        path = write_csv(content)
+        self.addCleanup(os.remove, path)
+        out, err = StringIO(), StringIO()
+        call_command("import_data", dataset, path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_services_import(self):
+        out, err = self.import_csv(
+            "services",
+            "service_type,name,description,price,is_active\n"
+            "Residential,Basic,Basic clean,100,True\n"
+            "Residential,Bad price,Clean,-5,True\n"
+            "Unknown,Deep,Deep clean,200,True\n",
+            "--batch-size", "2",
+        )
+        self.assertEqual(Service.objects.get().name, "Basic")
+        self.assertIn("Imported 1 rows, 2 rejected", out)
+        self.assertIn("line 3: price", err)
+        self.assertIn("line 4: service_type", err)
+
+    def test_services_import_invalidates_cached_catalog(self):
+        cache.clear()
+        self.assertEqual(get_price_table(), {})
+        self.assertEqual(get_service_type_overview()[0].service_count, 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.import_csv("services", "service_type,name,description,price\nResidential,Basic,Basic clean,100\n")
+        self.assertEqual(list(get_price_table().values()), [100])
+        self.assertEqual(get_service_type_overview()[0].service_count, 1)
+
+    def test_short_row_is_reported(self):
+        out, err = self.import_csv(
+            "services",
+            "service_type,name,price,description\n"
+            "Residential,Windows\n"
+            "Residential,Basic,100,Basic clean\n",
+        )
+        self.assertEqual(Service.objects.get().name, "Basic")
+        self.assertIn("Imported 1 rows, 1 rejected", out)
+        self.assertIn("line 2: row: Expected 4 values, found 2.", err)
+
+    def test_row_with_extra_column_is_reported(self):
+        out, err = self.import_csv(
+            "services",
+            "service_type,name,price,description\n"
+            "Residential,Windows,50,Clean,extra\n",
+        )
+        self.assertFalse(Service.objects.exists())
+        self.assertIn("line 2: row: Expected 4 values, found 5.", err)
+
+    def test_clients_dry_run_and_duplicates(self):
+        Client.objects.create(name="Existing", contact_number="+375291234567", email="taken@test.com")
+        out, err = self.import_csv(
+            "clients",
+            "name,contact_number,email\n"
+            "New,+375291234568,new@test.com\n"
+            "Copy,+375291234569,new@test.com\n"
+            "Taken,+375291234560,taken@test.com\n"
+            "Bad phone,12345,other@test.com\n",
+            "--dry-run",
+        )
+        self.assertEqual(Client.objects.count(), 1)
+        self.assertIn("Dry run: 1 valid rows, 3 rejected", out)
+        self.assertIn("line 5: contact_number", err)
+
+    def test_staff_import_resolves_users(self):
+        User.objects.create_user(username="cleaner")
+        self.import_csv(
+            "staff",
+            "username,contact_number,hire_date,role\n"
+            "cleaner,+375291234567,2024-01-01,Cleaner\n",
+        )
+        self.assertEqual(Staff.objects.get().user.username, "cleaner")
+
+    def test_clients_import_fills_lookup_keys(self):
+        self.import_csv("clients", "name,contact_number,email\nNew,+375291234568,New@Test.com\n")
+        client = Client.objects.get()
+        self.assertEqual((client.phone_key, client.email_key), ("375291234568", "new@test.com"))
+
+
+class ReconcileRatingSummaryCommandTest(TestCase):
+    def test_reports_and_fixes_drift(self):
+        author = User.objects.create_user(username="author")
+        Review.objects.create(title="Good", author=author, content="Text", score=7, status=Review.Status.APPROVED)
+        # Bulk updates bypass the signals that maintain the summary
+        Review.objects.update(score=3)
+
+        out = StringIO()
+        call_command("reconcile_rating_summary", stdout=out)
+        self.assertIn("score_7: stored 1, actual 0", out.getvalue())
+        summary = RatingSummary.get()
+        self.assertEqual((summary.total, summary.score_3, summary.score_7), (3, 1, 0))
+
+        out = StringIO()
+        call_command("reconcile_rating_summary", stdout=out)
+        self.assertIn("in sync", out.getvalue())
+
+
+class RebuildArticleIndexCommandTest(TestCase):
+    def test_rebuild(self):
+        author = User.objects.create_user(username="author")
+        Article.objects.create(title="Spring cleaning", author=author, content="Text")
+        out = StringIO()
+        call_command("rebuild_article_index", stdout=out)
+        self.assertIn("Indexed 1 articles", out.getvalue())
+        self.assertEqual(ArticleSearch("spring").count(), 1)
+
+
+class RenderArticlesCommandTest(TestCase):
+    def test_backfill(self):
+        author = User.objects.create_user(username="author")
+        article = Article.objects.create(title="Old", author=author, content="# Heading")
+        Article.objects.filter(pk=article.pk).update(content_html="")
+        out = StringIO()
+        call_command("render_articles", "--workers", "2", stdout=out)
+        self.assertIn("Rendered 1/1 articles", out.getvalue())
+        article.refresh_from_db()
+        self.assertEqual(article.content_html, "<h1>Heading</h1>")
+
+
+class ModerateReviewsCommandTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="author")
+
+    def test_scores_pending_reviews(self):
+        good = Review.objects.create(title="Great job", author=self.author, content="Very clean flat", score=9)
+        spam = Review.objects.create(title="Cheap loan", author=self.author,
+                                     content="Visit http://casino.example now", score=10)
+        out = StringIO()
+        call_command("moderate_reviews", "--workers", "2", "--batch-size", "1", stdout=out)
+        self.assertIn("Moderated 2 reviews (1 approved, 1 rejected)", out.getvalue())
+
+        good.refresh_from_db()
+        spam.refresh_from_db()
+        self.assertEqual(good.status, Review.Status.APPROVED)
+        self.assertEqual(spam.status, Review.Status.REJECTED)
+        self.assertEqual(spam.moderation_score, 1.0)
+        summary = RatingSummary.get()
+        self.assertEqual((summary.count, summary.score_9, summary.score_10), (1, 1, 0))
+
+    def test_moderated_reviews_are_left_alone(self):
+        Review.objects.create(title="Cheap loan", author=self.author, content="casino", score=3,
+                              status=Review.Status.APPROVED)
+        out = StringIO()
+        call_command("moderate_reviews", stdout=out)
+        self.assertIn("Moderated 0 reviews", out.getvalue())
+        self.assertEqual(Review.objects.get().status, Review.Status.APPROVED)
+
+
+class BenchmarkSignupsCommandTest(TestCase):
+    def test_compares_paths_and_cleans_up(self):
+        out = StringIO()
+        call_command("benchmark_signups", "--count", "2", stdout=out)
+        self.assertIn("legacy: 2 signups", out.getvalue())
+        self.assertIn("transactional: 2 signups", out.getvalue())
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(Client.objects.exists())
+
+
+class BenchmarkLoginsCommandTest(TestCase):
+    def test_reports_logins_per_core(self):
+        out = StringIO()
+        call_command("benchmark_logins", "--logins", "3", "--concurrency", "1", "--iterations", "1000", stdout=out)
+        self.assertIn("3 logins, 1000 iterations", out.getvalue())
+        self.assertIn("logins/s per core", out.getvalue())
+        self.assertFalse(User.objects.exists())
+
+
+class FindDuplicateClientsCommandTest(TestCase):
+    def test_lists_shared_phones_and_emails(self):
+        first = Client.objects.create(name="A", contact_number="+375291234567", email="a@test.com")
+        second = Client.objects.create(name="B", contact_number="+375291234567", email="A@Test.com ")
+        Client.objects.create(name="C", contact_number="+375291234568", email="c@test.com")
+
+        out, err = StringIO(), StringIO()
+        call_command("find_duplicate_clients", stdout=out, stderr=err)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[1:], [
+            f"email,a@test.com,{first.pk} {second.pk}",
+            f"phone,375291234567,{first.pk} {second.pk}",
+        ])
+        self.assertIn("2 groups", err.getvalue())
+
+
+class SyncReplicasCommandTest(TransactionTestCase):
+    # The backup needs the primary outside of a transaction
+    def test_requires_replicas(self):
+        with self.settings(DATABASE_REPLICAS=[]):
+            with self.assertRaises(CommandError):
+                call_command("sync_replicas")
+
+    def test_copies_primary_into_replica(self):
+        Client.objects.create(name="Replicated", contact_number="+375291234567")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "replica.sqlite3")
+            SyncReplicasCommand().sync([path])
+            replica = sqlite3.connect(path)
+            try:
+                names = replica.execute("SELECT name FROM cleaning_service_client").fetchall()
+            finally:
+                replica.close()
+        self.assertEqual(names, [("Replicated",)])
+
+
+class BenchmarkStampedeCommandTest(TestCase):
+    def test_single_flight_rebuilds_one_at_a_time(self):
+        out = StringIO()
+        call_command("benchmark_stampede", "--threads", "4", "--duration", "0.5", "--timeout", "0.2",
+                     "--cost", "0.05", stdout=out)
+        rows = {line[:26].strip(): line[26:].split() for line in out.getvalue().splitlines()[2:]}
+        self.assertEqual(rows["single-flight"][2], "1")
+        self.assertEqual(rows["single-flight, no early"][2], "1")
+
+
+class BuildImagesCommandTest(TestCase):
+    def test_renders_variants_and_index(self):
+        with tempfile.TemporaryDirectory() as static_dir, tempfile.TemporaryDirectory() as build_dir:
+            os.makedirs(os.path.join(static_dir, "banners"))
+            Image.new("RGBA", (400, 200), (255, 0, 0, 128)).save(os.path.join(static_dir, "banners", "logo.png"))
+            Image.new("RGB", (50, 50)).save(os.path.join(static_dir, "favicon.png"))
+            with override_settings(STATICFILES_DIRS=[static_dir], IMAGE_BUILD_DIR=build_dir,
+                                   IMAGE_VARIANT_SOURCES=["banners/"], IMAGE_VARIANT_WIDTHS=[100, 800], IMAGE_VARIANT_FORMATS=["webp"]):
+                out = StringIO()
+                call_command("build_images", "--processes", "1", stdout=out)
+                self.assertIn("1 images, 2 variants (2 rendered)", out.getvalue())
+                with Image.open(os.path.join(build_dir, "variants", "banners", "logo-100w.webp")) as variant:
+                    self.assertEqual(variant.size, (100, 50))
+                with open(os.path.join(build_dir, "variants", "variants.json")) as index_file:
+                    index = json.load(index_file)
+                self.assertEqual(index["banners/logo.png"]["sources"]["webp"],
+                                 [[100, "variants/banners/logo-100w.webp"], [400, "variants/banners/logo-400w.webp"]])
+
+                out = StringIO()
+                call_command("build_images", "--processes", "1", stdout=out)
+                self.assertIn("2 variants (0 rendered)", out.getvalue())
+
+
+class SqlitePragmasTest(TestCase):
+    def test_pragmas_applied_to_connection(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute("PRAGMA temp_store")
+            self.assertEqual(cursor.fetchone()[0], 2)
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 5000)
+
+    def test_rejects_invalid_pragma_name(self):
+        with self.assertRaises(ValueError):
+            pragma_statements({"journal_mode; DROP TABLE x": "WAL"})
+
+    def test_rejects_invalid_pragma_value(self):
+        self.assertEqual(pragma_statements({"journal_mode": "WAL", "cache_size": -2000}),
+                         ["PRAGMA journal_mode = WAL", "PRAGMA cache_size = -2000"])
+        for value in ("WAL; DROP TABLE x", "1.5", True):
+            with self.assertRaises(ValueError):
+                pragma_statements({"journal_mode": value})
+
+    def test_benchmark_reports_every_configuration(self):
+        out = StringIO()
+        call_command("benchmark_sqlite", "--processes", "2", "--duration", "0.2", stdout=out)
+        for name in ("default", "wal", "settings"):
+            self.assertIn(name, out.getvalue())
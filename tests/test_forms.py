@@ -1,8 +1,11 @@
 from django.test import TestCase
 from django.forms import formset_factory
 from django.utils import timezone
-from cleaning_service.models import PromoCode, Service, ServiceType
+from cleaning_service.models import Client, PromoCode, Service, ServiceType
 from cleaning_service.forms import OrderForm, OrderItemFormSet
+from users.forms import CustomUserCreationForm
+from client_profile.forms import ClientForm
+from globals.timezones import search_timezones
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -118,3 +121,93 @@ class OrderItemFormSetTest(TestCase):
         })
         self.assertFalse(formset.is_valid())
         self.assertIn("duplicate", formset.forms[1].errors["__all__"][0])
+
+
+class SignupFormTest(TestCase):
+    def get_form(self, **overrides):
+        data = {
+            "username": "jane",
+            "email": "jane@example.com",
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "name": "Jane Doe",
+            "contact_number": "+41791234567",
+            "client_type": Client.ClientType.PRIVATE,
+            "timezone": "Europe/Zurich",
+            "password1": "a-Long-passw0rd",
+            "password2": "a-Long-passw0rd",
+        }
+        data.update(overrides)
+        return CustomUserCreationForm(data)
+
+    def test_creates_populated_client(self):
+        form = self.get_form()
+        self.assertTrue(form.is_valid(), form.errors)
+        user = form.save()
+
+        client = Client.objects.get(user=user)
+        self.assertEqual(client.name, "Jane Doe")
+        self.assertEqual(client.email, "jane@example.com")
+        self.assertEqual(client.timezone, "Europe/Zurich")
+        self.assertEqual(Client.objects.count(), 1)
+        self.assertTrue(user.check_password("a-Long-passw0rd"))
+
+    def test_save_uses_two_inserts(self):
+        form = self.get_form()
+        self.assertTrue(form.is_valid(), form.errors)
+        # SAVEPOINT, INSERT user, INSERT client, RELEASE SAVEPOINT
+        with self.assertNumQueries(4):
+            form.save()
+
+    def test_commit_false_saves_profile_with_save_m2m(self):
+        form = self.get_form()
+        self.assertTrue(form.is_valid(), form.errors)
+        user = form.save(commit=False)
+        user.save()
+        form.save_m2m()
+        self.assertEqual(Client.objects.get(user=user).name, "Jane Doe")
+        self.assertEqual(Client.objects.count(), 1)
+
+    def test_signal_still_creates_profile_for_other_users(self):
+        user = User.objects.create_user(username="admin-created")
+        self.assertTrue(Client.objects.filter(user=user).exists())
+
+
+class TimezoneFieldTest(TestCase):
+    def get_form(self, timezone):
+        return ClientForm({
+            "name": "Jane Doe",
+            "client_type": Client.ClientType.PRIVATE,
+            "contact_number": "+375291234567",
+            "timezone": timezone,
+        })
+
+    def test_accepts_known_timezone(self):
+        self.assertTrue(self.get_form("Europe/Zurich").is_valid())
+
+    def test_rejects_unknown_timezone(self):
+        form = self.get_form("Mars/Olympus_Mons")
+        self.assertFalse(form.is_valid())
+        self.assertIn("timezone", form.errors)
+
+    def test_renders_text_input_with_datalist(self):
+        html = str(self.get_form("UTC")["timezone"])
+        self.assertIn('list="id_timezone_options"', html)
+        self.assertIn('<datalist id="id_timezone_options"></datalist>', html)
+        self.assertNotIn("<option", html)
+
+    def test_signup_rejects_unknown_timezone(self):
+        form = CustomUserCreationForm({"timezone": "Nowhere"})
+        self.assertFalse(form.is_valid())
+        self.assertIn("timezone", form.errors)
+
+
+class SearchTimezonesTest(TestCase):
+    def test_matches_any_segment(self):
+        self.assertEqual(search_timezones("zur"), ("Europe/Zurich",))
+        self.assertIn("America/New_York", search_timezones("new y"))
+        self.assertIn("America/New_York", search_timezones("america/new_"))
+
+    def test_limits_results(self):
+        self.assertEqual(len(search_timezones("a", limit=5)), 5)
+        self.assertEqual(search_timezones("nowhere"), ())
@@ -1,9 +1,11 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, make_password
 from django.utils import timezone
 from cleaning_service.models import *
 from blog.models import Article
+from users.hashers import PooledPBKDF2PasswordHasher
 from decimal import Decimal
 import uuid
 from datetime import timedelta
@@ -71,6 +73,19 @@ class ClientModelTest(TestCase):
         )
         self.assertEqual(client.contact_person, "Jane Smith")
 
+    def test_lookup_keys(self):
+        client = Client.objects.create(name="John Doe", contact_number="+375291234567", email=" John@Example.COM")
+        self.assertEqual((client.phone_key, client.email_key), ("375291234567", "john@example.com"))
+
+        client.contact_number = "+375441234567"
+        client.save(update_fields=["contact_number"])
+        self.assertEqual(Client.objects.get(pk=client.pk).phone_key, "375441234567")
+
+    def test_normalize_phone(self):
+        self.assertEqual(normalize_phone("+375 (29) 123-45-67"), "375291234567")
+        self.assertEqual(normalize_phone("8 029 123 45 67"), "375291234567")
+        self.assertEqual(normalize_phone(None), "")
+
 
 class StaffModelTest(TestCase):
     def setUp(self):
@@ -319,3 +334,24 @@ class ArticleModelTest(TestCase):
         article.img = 'https://example.com/image.jpg'
         article.save()
         self.assertEqual(article.img, 'https://example.com/image.jpg')
+
+
+# Password hashing
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class PooledPasswordHasherTest(TestCase):
+    def test_uses_configured_iterations(self):
+        encoded = make_password("secret")
+        self.assertTrue(encoded.startswith("pbkdf2_sha256$1000$"))
+        self.assertTrue(check_password("secret", encoded))
+        self.assertFalse(check_password("wrong", encoded))
+
+    def test_compatible_with_django_hasher(self):
+        encoded = PBKDF2PasswordHasher().encode("secret", "somesalt", 1000)
+        self.assertEqual(PooledPBKDF2PasswordHasher().encode("secret", "somesalt", 1000), encoded)
+
+    def test_hashes_in_every_pool_mode(self):
+        expected = PBKDF2PasswordHasher().encode("secret", "somesalt", 1000)
+        for pool in (None, "thread", "process"):
+            with self.subTest(pool=pool), override_settings(PASSWORD_HASHING_POOL=pool, PASSWORD_HASHING_WORKERS=1):
+                self.assertEqual(PooledPBKDF2PasswordHasher().encode("secret", "somesalt"), expected)
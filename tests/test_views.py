@@ -1,11 +1,43 @@
-from django.test import TestCase, RequestFactory
+from django.test import RequestFactory
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.core.cache import cache
+from django.db import connection, DatabaseError
+from django.test.utils import CaptureQueriesContext
 from unittest.mock import patch
 from blog.models import Article
+from reviews.models import Review, RatingSummary
+from reviews.pagination import REVIEWS_PAGE_SIZE
+from blog.views import ARTICLES_PAGE_SIZE
 from cleaning_service.models import *
 from cleaning_service.views import *
+from cleaning_service.activity import login_buffer
+from cleaning_service import routers
+from cleaning_service.middleware import ReplicaStickinessMiddleware, StaticFilesMiddleware
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.storage import storages
+import gzip
+import os
+from django.http import HttpResponse
+from django.test import override_settings
+from tests.base import TestCase, TransactionTestCase
+from django.db import transaction
+from globals.query_cache import get_stats
+from globals.single_flight import get_or_build, single_flight
+from globals.images import write_index
+from django.template import Context, Template
+import threading
+import time
+import io
 import json
+import tempfile
+import zipfile
+from django.core.management import call_command
+from client_profile.models import ClientJob
+from client_profile.admin import ClientJobAdmin
+from django.contrib import admin
+from client_profile.jobs import run_job, run_purge
 from datetime import datetime
 from django.utils import timezone
 
@@ -23,6 +55,7 @@ def create_staff_user():
 
 class IndexViewTest(TestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(username="testuser", password="testpass")
         self.article = Article.objects.create(
             title="Test Article",
@@ -40,6 +73,24 @@ class IndexViewTest(TestCase):
         self.assertTemplateUsed(response, "service/index.html")
         self.assertEqual(response.context["article"], self.article)
 
+    @patch("requests.get")
+    def test_latest_article_by_publication_date(self, mock_get):
+        older = Article.objects.create(title="Older", author=self.user, content="Old")
+        Article.objects.filter(pk=older.pk).update(publication_date=timezone.now() - timezone.timedelta(days=1))
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response.context["article"], self.article)
+
+    @patch("requests.get")
+    def test_latest_article_is_cached_until_articles_change(self, mock_get):
+        self.client.get(reverse("home"))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("home"))
+        self.assertFalse([query for query in queries if "blog_article" in query["sql"]])
+
+        newer = Article.objects.create(title="Newer", author=self.user, content="New")
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response.context["article"], newer)
+
 
 class StaticViewsTest(TestCase):
     def test_privacy_policy_view(self):
@@ -68,6 +119,496 @@ class StaticViewsTest(TestCase):
         self.assertIsNotNone(response.context["about"])
 
 
+class TimezoneLookupViewTest(TestCase):
+    def test_returns_matching_timezones(self):
+        response = self.client.get(reverse("timezones"), {"q": "zur"})
+        self.assertEqual(response.json(), {"results": ["Europe/Zurich"]})
+        self.assertIn("max-age=86400", response["Cache-Control"])
+
+    def test_profile_edit_page_has_no_timezone_options(self):
+        user = User.objects.create_user(username="client", password="secret")
+        self.client.force_login(user)
+        response = self.client.get(reverse("update_client", args=[user.client_profile.pk]))
+        self.assertContains(response, "js/timezone_picker.js")
+        self.assertNotContains(response, "<option value=\"Europe/Zurich\"")
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"], REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = routers.PrimaryReplicaRouter()
+        self.used = []
+
+    def view(self, write=False, commit=True):
+        def get_response(request):
+            if write:
+                # The test's transaction never commits, run the on_commit hooks as a commit would
+                with self.captureOnCommitCallbacks(execute=commit):
+                    FAQ.objects.create(question="Question", answer="Answer")
+            self.used.append(self.router.db_for_read(Client))
+            return HttpResponse()
+        return ReplicaStickinessMiddleware(get_response)
+
+    def test_reads_go_to_replicas_until_a_write(self):
+        tokens = routers.start_request(False)
+        try:
+            self.assertEqual(self.router.db_for_read(Client), "replica1")
+            self.assertEqual(self.router.db_for_write(Client), "default")
+            self.assertEqual(self.router.db_for_read(Client), "replica1")
+            FAQ.objects.create(question="Question", answer="Answer")
+            self.assertEqual(self.router.db_for_read(Client), "default")
+        finally:
+            routers.end_request(tokens)
+
+    def test_without_replicas_reads_use_primary(self):
+        tokens = routers.start_request(False)
+        try:
+            with self.settings(DATABASE_REPLICAS=[]):
+                self.assertEqual(self.router.db_for_read(Client), "default")
+        finally:
+            routers.end_request(tokens)
+
+    def test_write_sets_sticky_cookie(self):
+        response = self.view(write=True)(self.factory.get("/"))
+        self.assertEqual(self.used, ["default"])
+        self.assertEqual(response.cookies["primary_until"]["max-age"], 5)
+
+        response = self.view()(self.factory.get("/"))
+        self.assertEqual(self.used, ["default", "replica1"])
+        self.assertNotIn("primary_until", response.cookies)
+
+    def test_uncommitted_write_sets_no_cookie(self):
+        response = self.view(write=True, commit=False)(self.factory.get("/"))
+        self.assertEqual(self.used, ["default"])
+        self.assertNotIn("primary_until", response.cookies)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    @patch("requests.get")
+    def test_pages_reading_the_rating_summary_set_no_cookie(self, mock_get):
+        with self.captureOnCommitCallbacks(execute=True):
+            for url in (reverse("home"), reverse("reviews")):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("primary_until", response.cookies)
+
+    def test_post_and_sticky_cookie_pin_reads(self):
+        response = self.view()(self.factory.post("/"))
+        self.assertIn("primary_until", response.cookies)
+
+        request = self.factory.get("/")
+        request.COOKIES["primary_until"] = response.cookies["primary_until"].value
+        self.view()(request)
+        request.COOKIES["primary_until"] = "expired"
+        self.view()(request)
+        self.assertEqual(self.used, ["default", "default", "replica1"])
+
+
+# Reads routed to this alias fail, it is not in DATABASES: cache fills must use the primary
+@override_settings(DATABASE_REPLICAS=["lagging_replica"])
+class CacheFillFromPrimaryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="author", password="testpass")
+        Service.objects.create(service_type=ServiceType.objects.create(name="Home"), name="Windows", price=10)
+        Article.objects.create(title="First news", author=self.user, summary="Summary", content="Body")
+        Review.objects.create(title="Great", author=self.user, content="Clean!", score=9, status=Review.Status.APPROVED)
+        self.tokens = routers.start_request(False)
+
+    def tearDown(self):
+        routers.end_request(self.tokens)
+
+    def test_cached_values_are_built_from_the_primary(self):
+        from cleaning_service.quotes import get_price_table
+        from cleaning_service.catalog import get_service_type_overview
+        from blog.cache import get_latest_article
+        from blog.feeds import LatestArticlesFeed
+        from reviews.feeds import LatestReviewsFeed
+
+        self.assertEqual(list(get_price_table().values()), [10])
+        self.assertEqual([service_type.service_count for service_type in get_service_type_overview()], [1])
+        self.assertEqual(get_latest_article().title, "First news")
+        self.assertEqual([article.title for article in LatestArticlesFeed().items()], ["First news"])
+        self.assertEqual([review.title for review in LatestReviewsFeed().items()], ["Great"])
+
+
+class LoginActivityTest(TestCase):
+    def setUp(self):
+        login_buffer.clear()
+        self.user = User.objects.create_user(username="client", password="secret")
+        self.other = User.objects.create_user(username="other", password="secret")
+
+    def tearDown(self):
+        login_buffer.clear()
+
+    def test_logins_are_buffered_until_flush(self):
+        self.client.force_login(self.user)
+        self.client.force_login(self.user)
+        self.client.force_login(self.other)
+        self.assertEqual(Client.objects.get(user=self.user).logged_in, 0)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(login_buffer.flush(), 2)
+
+        client = Client.objects.get(user=self.user)
+        self.assertEqual(client.logged_in, 2)
+        self.assertIsNotNone(client.last_seen)
+        self.assertEqual(Client.objects.get(user=self.other).logged_in, 1)
+        self.assertEqual(login_buffer.flush(), 0)
+
+    def test_flushes_after_interval(self):
+        with self.settings(LOGIN_ACTIVITY_FLUSH_INTERVAL=0):
+            self.client.login(username="client", password="secret")
+            self.client.get(reverse("faq"))
+        self.assertEqual(Client.objects.get(user=self.user).logged_in, 1)
+
+    def test_failed_flush_is_logged_and_kept(self):
+        self.client.force_login(self.user)
+        with self.settings(LOGIN_ACTIVITY_FLUSH_INTERVAL=0), \
+                patch("cleaning_service.activity.Client.objects.filter", side_effect=DatabaseError), \
+                self.assertLogs("cleaning_service.signals", "ERROR"):
+            self.assertEqual(self.client.get(reverse("faq")).status_code, 200)
+        self.assertEqual(login_buffer.pending()[self.user.pk][0], 1)
+
+
+class ClientDataExportViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="client", password="secret")
+        self.profile = self.user.client_profile
+        self.profile.name = "Jane"
+        self.profile.save()
+        service = Service.objects.create(service_type=ServiceType.objects.create(name="Home"), name="Windows",
+                                         price=10)
+        for _ in range(3):
+            order = Order.objects.create(client=self.profile, address="Main St", work_date=timezone.now())
+            OrderItem.objects.create(order=order, service=service, quantity=2)
+        Review.objects.create(title="Shiny", author=self.user, content="Text", score=9)
+        Order.objects.create(client=create_client_user(), address="Elsewhere", work_date=timezone.now())
+        self.client.force_login(self.user)
+
+    def test_streams_zip_with_client_records(self):
+        response = self.client.get(reverse("client_data_export"))
+        self.assertTrue(response.streaming)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+
+        self.assertEqual(archive.namelist(), ["profile.json", "orders.csv", "reviews.csv", "articles.jsonl"])
+        profile = json.loads(archive.read("profile.json"))
+        self.assertEqual((profile["name"], profile["account"]["username"]), ("Jane", "client"))
+        orders = archive.read("orders.csv").decode().splitlines()
+        self.assertEqual(len(orders), 4)
+        self.assertNotIn("Elsewhere", "".join(orders))
+        self.assertIn("Shiny", archive.read("reviews.csv").decode())
+
+    def test_background_export(self):
+        with tempfile.TemporaryDirectory() as media_root, self.settings(MEDIA_ROOT=media_root):
+            self.client.post(reverse("request_client_export"))
+            self.client.post(reverse("request_client_export"))
+            job = ClientJob.objects.get()
+            call_command("run_client_jobs", stdout=io.StringIO())
+            job.refresh_from_db()
+            self.assertEqual(job.status, ClientJob.Status.DONE)
+
+            response = self.client.get(reverse("client_job_download", args=[job.pk]))
+            archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+            self.assertEqual(len(archive.read("orders.csv").decode().splitlines()), 4)
+            response.close()
+
+            other = User.objects.create_user(username="other")
+            self.client.force_login(other)
+            self.assertEqual(self.client.get(reverse("client_job_download", args=[job.pk])).status_code, 404)
+
+
+class DeleteClientViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="client", password="secret")
+        self.profile = self.user.client_profile
+        service = Service.objects.create(service_type=ServiceType.objects.create(name="Home"), name="Windows",
+                                         price=10)
+        for _ in range(3):
+            order = Order.objects.create(client=self.profile, address="Main St", work_date=timezone.now())
+            OrderItem.objects.create(order=order, service=service)
+        Review.objects.create(title="Shiny", author=self.user, content="Text", score=9)
+        self.client.force_login(self.user)
+
+    def test_deactivates_and_queues_purge(self):
+        response = self.client.post(reverse("delete_client", args=[self.profile.pk]))
+        self.assertRedirects(response, reverse("home"), fetch_redirect_response=False)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertNotIn("_auth_user_id", self.client.session)
+        self.assertEqual(Order.objects.count(), 3)
+
+        job = ClientJob.objects.get(kind=ClientJob.Kind.PURGE)
+        self.assertEqual((job.user, job.client), (self.user, self.profile))
+
+    def test_purge_deletes_in_chunks(self):
+        self.client.post(reverse("delete_client", args=[self.profile.pk]))
+        job = ClientJob.claim_next()
+        run_purge(job, chunk_size=2)
+        self.assertEqual((job.progress, job.total), (4, 4))
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Client.objects.exists())
+        self.assertFalse(OrderItem.objects.exists())
+        self.assertFalse(Review.objects.exists())
+
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.percent_done, job.client, job.user), (ClientJob.Status.DONE, 100, None, None))
+        self.assertEqual(ClientJobAdmin(ClientJob, admin.site).done(job), "100%")
+
+    def test_purge_deletes_exports(self):
+        with tempfile.TemporaryDirectory() as media_root, self.settings(MEDIA_ROOT=media_root):
+            self.client.post(reverse("request_client_export"))
+            export = run_job(ClientJob.claim_next())
+            path = export.result.path
+            self.assertTrue(os.path.exists(path))
+
+            self.client.post(reverse("delete_client", args=[self.profile.pk]))
+            with self.captureOnCommitCallbacks() as callbacks:
+                run_job(ClientJob.claim_next())
+            self.assertFalse(ClientJob.objects.filter(pk=export.pk).exists())
+            # Until the purge commits the file stays, a rollback would bring its row back
+            self.assertTrue(os.path.exists(path))
+            for callback in callbacks:
+                callback()
+            self.assertFalse(os.path.exists(path))
+
+
+class QueryCacheTest(TransactionTestCase):
+    # Outside of TestCase's transaction, where every write would bypass the cache
+    def setUp(self):
+        cache.clear()
+
+    def test_rows_are_cached_until_the_model_changes(self):
+        FAQ.objects.create(question="Q1", answer="A1")
+        self.assertEqual(len(FAQ.objects.all().cached()), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(FAQ.objects.all().cached()), 1)
+
+        FAQ.objects.create(question="Q2", answer="A2")
+        self.assertEqual(len(FAQ.objects.all().cached()), 2)
+        stats = get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertGreaterEqual(stats["invalidations"], 2)
+
+    def test_bulk_changes_invalidate(self):
+        promo = PromoCode.objects.create(code="TEN", value=10, valid_from=timezone.now(), valid_to=timezone.now())
+        self.assertEqual(len(PromoCode.objects.filter(is_active=True).cached()), 1)
+        PromoCode.objects.filter(pk=promo.pk).update(is_active=False)
+        self.assertEqual(PromoCode.objects.filter(is_active=True).cached(), [])
+
+        promo.is_active = True
+        PromoCode.objects.bulk_update([promo], ["is_active"])
+        self.assertEqual(len(PromoCode.objects.filter(is_active=True).cached()), 1)
+
+    def test_joined_models_invalidate(self):
+        service_type = ServiceType.objects.create(name="Old")
+        Vacancy.objects.create(job_title="Cleaner", job_description="Test", job_type=service_type)
+        self.assertEqual(Vacancy.objects.select_related("job_type").cached()[0].job_type.name, "Old")
+        service_type.name = "New"
+        service_type.save()
+        self.assertEqual(Vacancy.objects.select_related("job_type").cached()[0].job_type.name, "New")
+
+    def test_transaction_with_changes_bypasses_cache(self):
+        FAQ.objects.all().cached()
+        with transaction.atomic():
+            FAQ.objects.create(question="Q1", answer="A1")
+            self.assertEqual(len(FAQ.objects.all().cached()), 1)
+            transaction.set_rollback(True)
+        self.assertEqual(FAQ.objects.all().cached(), [])
+        self.assertEqual(get_stats()["misses"], 2)
+
+    @override_settings(DATABASE_REPLICAS=["lagging_replica"])
+    def test_rows_are_read_from_the_primary(self):
+        # Reads routed to the replica would fail, the alias is not in DATABASES
+        tokens = routers.start_request(False)
+        try:
+            FAQ.objects.all().cached()
+            FAQ.objects.create(question="Q1", answer="A1")
+            routers.end_request(tokens)
+            tokens = routers.start_request(False)
+            self.assertEqual(len(FAQ.objects.all().cached()), 1)
+        finally:
+            routers.end_request(tokens)
+
+    def test_stats_view_is_staff_only(self):
+        user = User.objects.create_user(username="staff", password="secret")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(reverse("query_cache_stats")).status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        FAQ.objects.all().cached()
+        response = self.client.get(reverse("query_cache_stats"))
+        self.assertEqual(response.json()["misses"], 1)
+
+
+class SingleFlightTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.builds = 0
+
+    def build(self, value="new", delay=0):
+        self.builds += 1
+        time.sleep(delay)
+        return value
+
+    def expired(self, value="old"):
+        cache.set("key", {"value": value, "expires": time.time() - 1, "delta": 0}, 60)
+
+    def test_concurrent_misses_build_once(self):
+        results = []
+        barrier = threading.Barrier(8)
+
+        def request():
+            barrier.wait()
+            results.append(get_or_build("key", lambda: self.build(delay=0.2), 60))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(results, ["new"] * 8)
+
+    def test_expired_value_is_served_while_another_request_rebuilds(self):
+        self.expired()
+        cache.add("key:lock", "other request", 30)
+        self.assertEqual(get_or_build("key", self.build, 60), "old")
+        self.assertEqual(self.builds, 0)
+
+        cache.delete("key:lock")
+        self.assertEqual(get_or_build("key", self.build, 60), "new")
+        self.assertEqual(get_or_build("key", self.build, 60), "new")
+        self.assertEqual(self.builds, 1)
+
+    def test_failed_rebuild_serves_stale_value(self):
+        def fail():
+            raise RuntimeError("database is down")
+
+        self.expired()
+        with self.assertLogs("globals.single_flight", "ERROR"):
+            self.assertEqual(get_or_build("key", fail, 60), "old")
+        cache.clear()
+        with self.assertRaises(RuntimeError):
+            get_or_build("key", fail, 60)
+
+    def test_refreshes_before_expiry(self):
+        cache.set("key", {"value": "old", "expires": time.time() + 5, "delta": 1}, 60)
+        with patch("globals.single_flight.random.random", return_value=0.1):
+            self.assertEqual(get_or_build("key", self.build, 60), "old")
+        with patch("globals.single_flight.random.random", return_value=0.999):
+            self.assertEqual(get_or_build("key", self.build, 60), "new")
+
+    def test_decorator(self):
+        @single_flight(lambda name: f"greeting:{name}", 60)
+        def greet(name):
+            return self.build(f"hello {name}")
+
+        self.assertEqual(greet("ann"), "hello ann")
+        self.assertEqual(greet("ann"), "hello ann")
+        greet.invalidate("ann")
+        greet("ann")
+        self.assertEqual(self.builds, 2)
+
+
+class ResponsiveImageTest(TestCase):
+    template = Template("{% load responsive_images %}"
+                        "{% responsive_image 'images/logo.png' alt='Logo' sizes='120px' class='logo' %}")
+
+    def test_plain_img_without_variants(self):
+        with tempfile.TemporaryDirectory() as build_dir, self.settings(IMAGE_BUILD_DIR=build_dir):
+            html = self.template.render(Context())
+        self.assertHTMLEqual(html, '<img src="/static/images/logo.png" alt="Logo" class="logo">')
+
+    def test_picture_with_srcsets(self):
+        with tempfile.TemporaryDirectory() as build_dir, self.settings(IMAGE_BUILD_DIR=build_dir):
+            write_index(build_dir, {"images/logo.png": {"width": 400, "height": 200, "sources": {
+                "webp": [[160, "variants/images/logo-160w.webp"], [400, "variants/images/logo-400w.webp"]],
+                "avif": [[160, "variants/images/logo-160w.avif"]],
+            }}})
+            html = self.template.render(Context())
+        self.assertHTMLEqual(html, (
+            '<picture>'
+            '<source type="image/avif" srcset="/static/variants/images/logo-160w.avif 160w" sizes="120px">'
+            '<source type="image/webp" srcset="/static/variants/images/logo-160w.webp 160w, '
+            '/static/variants/images/logo-400w.webp 400w" sizes="120px">'
+            '<img src="/static/images/logo.png" alt="Logo" class="logo">'
+            '</picture>'
+        ))
+
+
+class StaticFilesMiddlewareTest(TestCase):
+    css = b"body { color: #123456; }\n" * 200
+
+    def setUp(self):
+        source_dir = tempfile.TemporaryDirectory()
+        self.static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(source_dir.cleanup)
+        self.addCleanup(self.static_root.cleanup)
+        os.makedirs(os.path.join(source_dir.name, "css"))
+        with open(os.path.join(source_dir.name, "css", "site.css"), "wb") as css_file:
+            css_file.write(self.css)
+        with open(os.path.join(source_dir.name, "clip.bin"), "wb") as binary_file:
+            binary_file.write(bytes(range(256)) * 4)
+
+        overrides = override_settings(STATICFILES_DIRS=[source_dir.name], STATIC_ROOT=self.static_root.name,
+                                      STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"])
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+        self.factory = RequestFactory()
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponse("view", status=404))
+
+    def test_collect_writes_gzip_siblings(self):
+        hashed = os.path.join(self.static_root.name, storages["staticfiles"].stored_name("css/site.css"))
+        with open(f"{hashed}.gz", "rb") as sibling:
+            self.assertEqual(gzip.decompress(sibling.read()), self.css)
+        self.assertFalse(os.path.exists(os.path.join(self.static_root.name, "clip.bin.gz")))
+
+    def test_hashed_file_is_immutable_and_precompressed(self):
+        url = "/static/" + storages["staticfiles"].stored_name("css/site.css")
+        response = self.middleware(self.factory.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), self.css)
+        self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+        response = self.middleware(self.factory.get(url, HTTP_ACCEPT_ENCODING="gzip;q=0"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, self.css)
+
+    def test_plain_name_is_revalidated(self):
+        response = self.middleware(self.factory.get("/static/css/site.css"))
+        self.assertEqual(response["Cache-Control"], "public, max-age=60")
+        response = self.middleware(self.factory.get("/static/css/site.css", HTTP_IF_NONE_MATCH=response["ETag"]))
+        self.assertEqual(response.status_code, 304)
+
+    def test_range(self):
+        response = self.middleware(self.factory.get("/static/clip.bin", HTTP_RANGE="bytes=10-19"))
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 10-19/1024")
+        self.assertEqual(response.content, bytes(range(10, 20)))
+        response = self.middleware(self.factory.get("/static/clip.bin", HTTP_RANGE="bytes=2000-"))
+        self.assertEqual(response.status_code, 416)
+
+    def test_other_paths_reach_the_views(self):
+        self.assertEqual(self.middleware(self.factory.get("/static/missing.css")).content, b"view")
+        self.assertEqual(self.middleware(self.factory.post("/static/css/site.css")).content, b"view")
+
+    def test_not_used_before_collectstatic(self):
+        with self.settings(STATIC_ROOT=os.path.join(self.static_root.name, "missing")):
+            with self.assertRaises(MiddlewareNotUsed):
+                StaticFilesMiddleware(lambda request: HttpResponse())
+
+    def test_not_used_in_debug(self):
+        with self.settings(DEBUG=True):
+            with self.assertRaises(MiddlewareNotUsed):
+                StaticFilesMiddleware(lambda request: HttpResponse())
+
+
 class CatFactViewTest(TestCase):
     @patch("requests.get")
     def test_successful_fetch(self, mock_get):
@@ -105,6 +646,7 @@ class PromoCodeViewTest(TestCase):
 
 class ServiceViewsTest(TestCase):
     def setUp(self):
+        cache.clear()
         self.service_type = ServiceType.objects.create(name="Residential")
         self.service = Service.objects.create(
             service_type=self.service_type,
@@ -116,6 +658,23 @@ class ServiceViewsTest(TestCase):
         response = self.client.get(reverse("service_types"))
         self.assertQuerySetEqual(response.context["service_types"], [self.service_type])
 
+    def test_service_type_stats_are_cached(self):
+        Service.objects.create(service_type=self.service_type, name="Deep Clean", price=300, is_active=False)
+        response = self.client.get(reverse("service_types"))
+        service_type = response.context["service_types"][0]
+        self.assertEqual(service_type.service_count, 2)
+        self.assertEqual(service_type.active_count, 1)
+        self.assertEqual(service_type.min_price, 100)
+        self.assertEqual(service_type.max_price, 300)
+        self.assertContains(response, "average $200.00")
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse("service_types"))
+
+        ServiceType.objects.create(name="Commercial")
+        response = self.client.get(reverse("service_types"))
+        self.assertEqual(len(response.context["service_types"]), 2)
+
     def test_service_filter_view(self):
         response = self.client.get(reverse("services") + "?service_type=1&price__gt=&price__lt=")
         self.assertContains(response, "Basic Clean")
@@ -197,3 +756,351 @@ class AddOrderViewTest(TestCase):
         self.client.login(username="client", password="testpass")
         response = self.client.post(reverse("order_create"), {})
         self.assertEqual(response.status_code, 302)
+
+
+class ExportViewTest(TestCase):
+    def setUp(self):
+        self.client_user = create_client_user()
+        self.service = Service.objects.create(
+            service_type=ServiceType.objects.create(name="Test"),
+            name="Test Service",
+            price=100
+        )
+        self.order = Order.objects.create(client=self.client_user, address="Test", work_date=timezone.now())
+        OrderItem.objects.create(order=self.order, service=self.service, quantity=2)
+
+    def test_export_requires_staff(self):
+        User.objects.create_user(username="plain", password="testpass")
+        self.client.login(username="plain", password="testpass")
+        response = self.client.get(reverse("export", args=["orders", "csv"]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_orders_csv_export(self):
+        User.objects.create_superuser(username="admin", password="adminpass")
+        self.client.login(username="admin", password="adminpass")
+        response = self.client.get(reverse("export", args=["orders", "csv"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn(str(self.order.order_code), lines[1])
+        self.assertIn("Test Service", lines[1])
+
+    def test_services_jsonl_export(self):
+        User.objects.create_superuser(username="admin", password="adminpass")
+        self.client.login(username="admin", password="adminpass")
+        response = self.client.get(reverse("export", args=["services", "jsonl"]))
+        records = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(records[0]["name"], "Test Service")
+        self.assertEqual(records[0]["price"], "100.00")
+
+    def test_unknown_dataset(self):
+        User.objects.create_superuser(username="admin", password="adminpass")
+        self.client.login(username="admin", password="adminpass")
+        response = self.client.get(reverse("export", args=["users", "csv"]))
+        self.assertEqual(response.status_code, 404)
+
+
+class AdminImportViewTest(TestCase):
+    def setUp(self):
+        User.objects.create_superuser(username="admin", password="adminpass")
+        self.client.login(username="admin", password="adminpass")
+        ServiceType.objects.create(name="Residential")
+
+    def test_upload_creates_services(self):
+        upload = SimpleUploadedFile(
+            "services.csv",
+            b"service_type,name,description,price\nResidential,Basic,Basic clean,100\n",
+            content_type="text/csv",
+        )
+        response = self.client.post(reverse("admin:cleaning_service_service_import_csv"), {"csv_file": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Imported 1 rows")
+        self.assertTrue(Service.objects.filter(name="Basic").exists())
+
+
+class ClientLookupViewTest(TestCase):
+    def setUp(self):
+        self.match = Client.objects.create(name="Jane", contact_number="+375291234567", email="jane@test.com")
+        Client.objects.create(name="Other", contact_number="+375291234568", email="other@test.com")
+        User.objects.create_superuser(username="admin", password="adminpass")
+        self.client.login(username="admin", password="adminpass")
+
+    def test_exact_phone_match_in_any_format(self):
+        response = self.client.get(reverse("client_lookup"), {"phone": "8 (029) 123-45-67"})
+        self.assertEqual([client["id"] for client in response.json()["results"]], [self.match.pk])
+
+    def test_email_match_ignores_case(self):
+        response = self.client.get(reverse("client_lookup"), {"email": "JANE@test.com"})
+        self.assertEqual([client["name"] for client in response.json()["results"]], ["Jane"])
+
+    def test_requires_a_parameter(self):
+        self.assertEqual(self.client.get(reverse("client_lookup")).status_code, 400)
+
+    def test_requires_staff(self):
+        User.objects.create_user(username="plain", password="testpass")
+        self.client.login(username="plain", password="testpass")
+        self.assertEqual(self.client.get(reverse("client_lookup"), {"phone": "1"}).status_code, 403)
+
+    def test_admin_search_uses_lookup_keys(self):
+        url = reverse("admin:cleaning_service_client_changelist")
+        response = self.client.get(url, {"q": "+375 29 123 45 67"})
+        self.assertEqual(list(response.context["cl"].queryset), [self.match])
+        response = self.client.get(url, {"q": "Other"})
+        self.assertEqual(response.context["cl"].result_count, 1)
+
+    def test_admin_search_partial_email_and_phone(self):
+        url = reverse("admin:cleaning_service_client_changelist")
+        response = self.client.get(url, {"q": "@test.com"})
+        self.assertEqual(response.context["cl"].result_count, 2)
+        response = self.client.get(url, {"q": "1234567"})
+        self.assertEqual(list(response.context["cl"].queryset), [self.match])
+
+
+class QuoteViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        service_type = ServiceType.objects.create(name="Test")
+        self.basic = Service.objects.create(service_type=service_type, name="Basic", price=100)
+        self.windows = Service.objects.create(service_type=service_type, name="Windows", price="12.50")
+        self.promo = PromoCode.objects.create(code="TEN", discount_type=PromoCode.DiscountType.PERCENTAGE, value=10,
+                                              valid_from=timezone.now(), valid_to=timezone.now())
+
+    def post(self, payload):
+        return self.client.post(reverse("order_quote"), data=json.dumps(payload), content_type="application/json")
+
+    def test_single_cart_matches_order_total(self):
+        items = [{"service": self.basic.id, "quantity": 2}, {"service": self.windows.id, "quantity": 3}]
+        response = self.post({"items": items, "promo_code": "TEN"})
+        self.assertEqual(response.status_code, 200)
+
+        order = Order.objects.create(client=create_client_user(), address="Test",
+                                     work_date=timezone.now(), promo_code=self.promo)
+        OrderItem.objects.create(order=order, service=self.basic, quantity=2)
+        OrderItem.objects.create(order=order, service=self.windows, quantity=3)
+        order.save_calculate_total()
+        self.assertEqual(response.json()["total"], str(order.total_amount))
+        self.assertEqual(response.json()["subtotal"], "237.50")
+
+    def test_many_carts_in_one_call(self):
+        response = self.post({"carts": [
+            {"items": [{"service": self.basic.id, "quantity": 1}]},
+            {"items": [{"service": self.basic.id, "quantity": 1}], "promo_code": "NOPE"},
+        ]})
+        quotes = response.json()["quotes"]
+        self.assertEqual(quotes[0]["total"], "100.00")
+        self.assertIn("error", quotes[1])
+
+    def test_price_table_is_cached_and_invalidated(self):
+        payload = {"items": [{"service": self.basic.id, "quantity": 1}]}
+        self.post(payload)
+        with self.assertNumQueries(0):
+            self.post(payload)
+        self.basic.price = 80
+        self.basic.save()
+        self.assertEqual(self.post(payload).json()["total"], "80.00")
+
+    def test_invalid_cart(self):
+        response = self.post({"items": [{"service": self.basic.id, "quantity": 0}]})
+        self.assertEqual(response.status_code, 400)
+
+
+class ReviewViewTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="author", password="testpass")
+        for i in range(25):
+            Review.objects.create(title=f"Review {i}", author=self.author, content="Text", score=5,
+                                  status=Review.Status.APPROVED)
+
+    def test_first_page_is_newest_first(self):
+        # One query for the page with its authors, one for the rating summary
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("reviews"))
+        reviews = response.context["reviews"]
+        self.assertEqual(len(reviews), REVIEWS_PAGE_SIZE)
+        self.assertEqual(reviews[0].title, "Review 24")
+        self.assertIsNotNone(response.context["next_cursor"])
+
+    def test_load_more_fragment(self):
+        cursor = self.client.get(reverse("reviews")).context["next_cursor"]
+        response = self.client.get(reverse("more_reviews"), {"cursor": cursor})
+        page = response.json()
+        self.assertIsNone(page["next_cursor"])
+        self.assertIn("Review 4 |", page["html"])
+        self.assertNotIn("Review 5 |", page["html"])
+
+    def test_pending_reviews_are_hidden(self):
+        Review.objects.create(title="Unmoderated", author=self.author, content="Text", score=5)
+        response = self.client.get(reverse("reviews"))
+        self.assertNotIn("Unmoderated", [review.title for review in response.context["reviews"]])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("more_reviews"), {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_edited_review_is_moderated_again(self):
+        review = Review.objects.create(title="Fine", author=self.author, content="Text", score=5,
+                                       status=Review.Status.APPROVED, moderation_score=0.1,
+                                       moderated_at=timezone.now())
+        self.client.force_login(self.author)
+        url = reverse("edit_review", args=[review.pk])
+
+        self.client.post(url, {"title": "Fine", "content": "Text", "score": 7})
+        review.refresh_from_db()
+        self.assertEqual((review.status, review.score), (Review.Status.APPROVED, 7))
+
+        count = RatingSummary.get().count
+        self.client.post(url, {"title": "Fine", "content": "Buy cheap watches", "score": 7})
+        review.refresh_from_db()
+        self.assertEqual((review.status, review.moderation_score, review.moderated_at),
+                         (Review.Status.PENDING, None, None))
+        self.assertEqual(RatingSummary.get().count, count - 1)
+
+
+class RatingSummaryTest(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="author", password="testpass")
+
+    def test_summary_follows_review_changes(self):
+        review = Review.objects.create(title="Good", author=self.author, content="Text", score=8,
+                                       status=Review.Status.APPROVED)
+        Review.objects.create(title="Bad", author=self.author, content="Text", score=2, status=Review.Status.APPROVED)
+        summary = RatingSummary.get()
+        self.assertEqual((summary.count, summary.total, summary.score_8, summary.score_2), (2, 10, 1, 1))
+
+        review = Review.objects.get(pk=review.pk)
+        review.score = 6
+        review.save()
+        summary = RatingSummary.get()
+        self.assertEqual((summary.count, summary.total, summary.score_8, summary.score_6), (2, 8, 0, 1))
+
+        review.delete()
+        summary = RatingSummary.get()
+        self.assertEqual((summary.count, summary.total, summary.score_6), (1, 2, 0))
+
+    def test_only_approved_reviews_count(self):
+        review = Review.objects.create(title="Pending", author=self.author, content="Text", score=4)
+        self.assertEqual(RatingSummary.get().count, 0)
+
+        review = Review.objects.get(pk=review.pk)
+        review.status = Review.Status.APPROVED
+        review.save()
+        self.assertEqual((RatingSummary.get().count, RatingSummary.get().score_4), (1, 1))
+
+        review.status = Review.Status.REJECTED
+        review.save()
+        self.assertEqual(RatingSummary.get().count, 0)
+
+    def test_summary_endpoint(self):
+        Review.objects.create(title="Good", author=self.author, content="Text", score=9, status=Review.Status.APPROVED)
+        Review.objects.create(title="Fine", author=self.author, content="Text", score=6, status=Review.Status.APPROVED)
+        data = self.client.get(reverse("rating_summary")).json()
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(data["average"], 7.5)
+        self.assertEqual(data["histogram"]["9"], 1)
+
+
+class ArticleSearchViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="author", password="testpass")
+        self.windows = Article.objects.create(title="Window cleaning tips", author=self.user,
+                                              summary="Streak-free glass", content="Use a squeegee on windows.")
+        self.carpet = Article.objects.create(title="Carpet care", author=self.user,
+                                             summary="Deep cleaning", content="Vacuum <b>twice</b>, then mention windows.")
+
+    def test_ranked_and_highlighted_results(self):
+        response = self.client.get(reverse("article_search"), {"q": "windows"})
+        results = list(response.context["page"])
+        self.assertEqual([result.article for result in results], [self.windows, self.carpet])
+        self.assertIn("<mark>Window</mark>", results[0].title)
+        self.assertIn("&lt;b&gt;twice&lt;/b&gt;", results[1].snippet)
+
+    def test_index_follows_saves_and_deletes(self):
+        self.carpet.title = "Rug care"
+        self.carpet.save()
+        response = self.client.get(reverse("article_search"), {"q": "rug"})
+        self.assertEqual(response.context["page"].paginator.count, 1)
+
+        self.carpet.delete()
+        response = self.client.get(reverse("article_search"), {"q": "rug"})
+        self.assertEqual(response.context["page"].paginator.count, 0)
+
+    def test_query_syntax_is_escaped(self):
+        response = self.client.get(reverse("article_search"), {"q": 'glass" OR (NEAR'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["page"].paginator.count, 0)
+
+
+class ArticlesViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="author", password="testpass")
+        for i in range(15):
+            Article.objects.create(title=f"Article {i}", author=self.user, summary="Summary", content="Long body")
+
+    def test_paginated_without_bodies(self):
+        # One count query and one page query that includes the authors
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("articles"))
+        articles = response.context["articles"]
+        self.assertEqual(len(articles), ARTICLES_PAGE_SIZE)
+        self.assertEqual(articles[0].title, "Article 14")
+        self.assertIn("content", articles[0].get_deferred_fields())
+        self.assertContains(response, "By author")
+
+    def test_last_page(self):
+        response = self.client.get(reverse("articles"), {"page": 2})
+        self.assertEqual(len(response.context["articles"]), 15 - ARTICLES_PAGE_SIZE)
+
+
+class ArticleViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="author", password="testpass")
+        self.article = Article.objects.create(
+            title="Markdown", author=self.user,
+            content="Some **bold** text\n\n<script>alert(1)</script>[link](javascript:alert(1))"
+        )
+
+    def test_serves_sanitized_html(self):
+        response = self.client.get(reverse("article", args=[self.article.id]))
+        self.assertContains(response, "<strong>bold</strong>")
+        self.assertNotContains(response, "<script>alert")
+        self.assertNotContains(response, "javascript:")
+
+    def test_etag_conditional_get(self):
+        response = self.client.get(reverse("article", args=[self.article.id]))
+        etag = response["ETag"]
+        response = self.client.get(reverse("article", args=[self.article.id]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.article.content = "Changed"
+        self.article.save()
+        response = self.client.get(reverse("article", args=[self.article.id]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class FeedViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="author", password="testpass")
+        Article.objects.create(title="First news", author=self.user, summary="Summary", content="Body")
+        Review.objects.create(title="Great", author=self.user, content="Clean!", score=9, status=Review.Status.APPROVED)
+
+    def test_feeds_render(self):
+        for name, text in [("articles_rss", "First news"), ("articles_atom", "First news"),
+                           ("reviews_rss", "Great (9/10)"), ("reviews_atom", "Great (9/10)")]:
+            response = self.client.get(reverse(name))
+            self.assertContains(response, text)
+            self.assertTrue(response.has_header("ETag"))
+
+    def test_unchanged_feed_is_not_modified_without_queries(self):
+        response = self.client.get(reverse("articles_atom"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("articles_atom"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_item_regenerates_feed(self):
+        etag = self.client.get(reverse("reviews_rss"))["ETag"]
+        Review.objects.create(title="Even better", author=self.user, content="Wow", score=10, status=Review.Status.APPROVED)
+        response = self.client.get(reverse("reviews_rss"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Even better")
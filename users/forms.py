@@ -1,7 +1,9 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from cleaning_service.models import Client
+from globals.timezones import TimezoneField
 
 User = get_user_model()
 
@@ -25,9 +27,8 @@ class CustomUserCreationForm(UserCreationForm):
         choices=Client.ClientType.choices,
         initial=Client.ClientType.PRIVATE
     )
-    timezone = forms.CharField(
-        max_length=30,
-        required=True,
+    timezone = TimezoneField(
+        initial="UTC",
         help_text="Timezone"
     )
 
@@ -42,28 +43,36 @@ class CustomUserCreationForm(UserCreationForm):
         return email
 
     def save(self, commit=True):
+        """Creates the user and its fully populated client profile in one transaction.
+
+        The profile is built here instead of letting the post_save signal create an
+        empty one that would have to be fetched and updated again. With commit=False
+        it is saved by save_m2m(), like Django defers many-to-many data.
+        """
         user = super().save(commit=False)
         user.email = self.cleaned_data["email"]
         user.first_name = self.cleaned_data["first_name"]
         user.last_name = self.cleaned_data["last_name"]
+        user._skip_client_profile = True
 
-        if commit:
-            user.save()
-
-        client = Client.objects.get(user=user)
-        client.name = self.cleaned_data["name"]
-        client.contact_number = self.cleaned_data["contact_number"]
-        client.client_type = self.cleaned_data["client_type"]
-        client.email = self.cleaned_data["email"]
-        client.timezone = self.cleaned_data["timezone"]
-        client.save()
-
-        client.save()
+        self.client_profile = Client(
+            user=user,
+            name=self.cleaned_data["name"],
+            contact_number=self.cleaned_data["contact_number"],
+            client_type=self.cleaned_data["client_type"],
+            email=self.cleaned_data["email"],
+            timezone=self.cleaned_data["timezone"],
+        )
 
-        user = client.user
-        user.email = client.email
-        user.first_name = self.cleaned_data["first_name"]
-        user.last_name = self.cleaned_data["last_name"]
-        user.save()
+        if commit:
+            with transaction.atomic():
+                user.save()
+                self._save_profile_and_m2m()
+        else:
+            self.save_m2m = self._save_profile_and_m2m
 
         return user
+
+    def _save_profile_and_m2m(self):
+        self.client_profile.save()
+        self._save_m2m()
@@ -0,0 +1,81 @@
+import base64
+import hashlib
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.encoding import force_bytes
+
+POOL_SETTINGS = {"PASSWORD_HASHING_POOL", "PASSWORD_HASHING_WORKERS"}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _pbkdf2(digest_name, password, salt, iterations):
+    return hashlib.pbkdf2_hmac(digest_name, password, salt, iterations)
+
+
+def get_pool():
+    """Returns the shared hashing pool, or None when hashing runs in the calling thread."""
+    global _pool
+    kind = getattr(settings, "PASSWORD_HASHING_POOL", None)
+    if not kind:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            executor = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}[kind]
+            _pool = executor(max_workers=settings.PASSWORD_HASHING_WORKERS)
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def _forget_pool():
+    # A forked worker must not reuse the threads or processes of its parent
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_pool)
+
+
+@receiver(setting_changed)
+def reset_pool(*, setting, **kwargs):
+    if setting in POOL_SETTINGS:
+        shutdown_pool()
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count from settings and hashing done in a bounded pool.
+
+    Hashes stay compatible with Django's default hasher. Only PASSWORD_HASHING_WORKERS
+    hashes run at once, so a burst of logins queues for the pool instead of taking
+    every CPU away from the other requests. hashlib releases the GIL while hashing,
+    so a thread pool is enough; a process pool isolates hashing completely.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_HASH_ITERATIONS", PBKDF2PasswordHasher.iterations)
+
+    def encode(self, password, salt, iterations=None):
+        self._check_encode_args(password, salt)
+        iterations = iterations or self.iterations
+        args = (self.digest().name, force_bytes(password), force_bytes(salt), iterations)
+
+        pool = get_pool()
+        hash = pool.submit(_pbkdf2, *args).result() if pool else _pbkdf2(*args)
+        hash = base64.b64encode(hash).decode("ascii").strip()
+        return "%s$%d$%s$%s" % (self.algorithm, iterations, salt, hash)
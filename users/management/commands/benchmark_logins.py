@@ -0,0 +1,83 @@
+import os
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+User = get_user_model()
+
+PASSWORD = "a-Long-passw0rd"
+
+
+def available_cores():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class Command(BaseCommand):
+    help = "Measures logins per second through django.contrib.auth with the configured password hasher."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logins", type=int, default=40)
+        parser.add_argument("--concurrency", type=int, default=4, help="Threads logging in at the same time")
+        parser.add_argument("--iterations", type=int, help="Override PASSWORD_HASH_ITERATIONS")
+        parser.add_argument("--pool", choices=("none", "thread", "process"), help="Override PASSWORD_HASHING_POOL")
+        parser.add_argument("--workers", type=int, help="Override PASSWORD_HASHING_WORKERS")
+
+    def handle(self, *args, **options):
+        overrides = {}
+        if options["iterations"]:
+            overrides["PASSWORD_HASH_ITERATIONS"] = options["iterations"]
+        if options["pool"]:
+            overrides["PASSWORD_HASHING_POOL"] = None if options["pool"] == "none" else options["pool"]
+        if options["workers"]:
+            overrides["PASSWORD_HASHING_WORKERS"] = options["workers"]
+
+        with override_settings(**overrides):
+            username = f"bench-{uuid.uuid4().hex[:8]}"
+            user = User.objects.create_user(username=username, password=PASSWORD)
+            try:
+                latencies, elapsed = self.run(username, options["logins"], options["concurrency"])
+            finally:
+                user.delete()
+
+            cores = available_cores()
+            rate = len(latencies) / elapsed
+            self.stdout.write(
+                f"{len(latencies)} logins, {settings.PASSWORD_HASH_ITERATIONS} iterations, "
+                f"pool={settings.PASSWORD_HASHING_POOL or 'none'} ({settings.PASSWORD_HASHING_WORKERS} workers), "
+                f"concurrency={options['concurrency']}"
+            )
+            self.stdout.write(
+                f"{rate:.1f} logins/s, {rate / cores:.1f} logins/s per core ({cores} cores), "
+                f"p50 {statistics.median(latencies) * 1000:.0f}ms, "
+                f"max {max(latencies) * 1000:.0f}ms"
+            )
+
+    def run(self, username, logins, concurrency):
+        def login(_):
+            started = time.perf_counter()
+            if authenticate(username=username, password=PASSWORD) is None:
+                raise CommandError("Authentication failed")
+            return time.perf_counter() - started
+
+        def threaded_login(number):
+            try:
+                return login(number)
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        if concurrency == 1:
+            latencies = [login(number) for number in range(logins)]
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                latencies = list(pool.map(threaded_login, range(logins)))
+        return latencies, time.perf_counter() - started
@@ -0,0 +1,93 @@
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from cleaning_service.models import Client
+from users.forms import CustomUserCreationForm
+
+User = get_user_model()
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+def legacy_save(form):
+    """The signup path before it was made transactional, kept for comparison."""
+    user = super(CustomUserCreationForm, form).save(commit=False)
+    user.email = form.cleaned_data["email"]
+    user.first_name = form.cleaned_data["first_name"]
+    user.last_name = form.cleaned_data["last_name"]
+    user.save()
+
+    client = Client.objects.get(user=user)
+    client.name = form.cleaned_data["name"]
+    client.contact_number = form.cleaned_data["contact_number"]
+    client.client_type = form.cleaned_data["client_type"]
+    client.email = form.cleaned_data["email"]
+    client.timezone = form.cleaned_data["timezone"]
+    client.save()
+    client.save()
+
+    user = client.user
+    user.email = client.email
+    user.save()
+    return user
+
+
+def current_save(form):
+    return form.save()
+
+
+class Command(BaseCommand):
+    help = "Compares signup throughput and statement counts of the legacy and the transactional signup path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=200, help="Signups per path")
+        parser.add_argument("--real-hasher", action="store_true",
+                            help="Hash passwords with the configured hasher instead of a fast one")
+
+    def handle(self, *args, **options):
+        if options["real_hasher"]:
+            self.run_all(options["count"])
+        else:
+            with override_settings(PASSWORD_HASHERS=FAST_HASHERS):
+                self.run_all(options["count"])
+
+    def run_all(self, count):
+        for name, save in (("legacy", legacy_save), ("transactional", current_save)):
+            prefix = f"bench-{uuid.uuid4().hex[:8]}-"
+            try:
+                elapsed, queries = self.run(save, prefix, count)
+            finally:
+                User.objects.filter(username__startswith=prefix).delete()
+            self.stdout.write(f"{name}: {count} signups in {elapsed:.2f}s, {count / elapsed:.0f} signups/s, "
+                              f"{queries / count:.1f} statements per signup")
+
+    def run(self, save, prefix, count):
+        forms = []
+        for i in range(count):
+            form = CustomUserCreationForm({
+                "username": f"{prefix}{i}",
+                "email": f"{prefix}{i}@example.com",
+                "first_name": "Bench",
+                "last_name": "User",
+                "name": "Bench User",
+                "contact_number": "+41791234567",
+                "client_type": Client.ClientType.PRIVATE,
+                "timezone": "UTC",
+                "password1": "a-Long-passw0rd",
+                "password2": "a-Long-passw0rd",
+            })
+            if not form.is_valid():
+                raise ValueError(form.errors.as_text())
+            forms.append(form)
+
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            for form in forms:
+                save(form)
+            elapsed = time.perf_counter() - started
+        return elapsed, len(captured.captured_queries)